@@ -0,0 +1,74 @@
+"""
+Date-validation benchmark for clean_csv.
+
+    python -m benchmarks.bench_clean_dates --rows 3000000
+
+Compares the old per-row `apply(is_valid_date)` (dateutil on every row)
+against `normalize_dates` (one vectorized ISO pass, then dateutil once per
+distinct leftover string) on a synthetic item_date_issued column cycled
+from data/cleaned/newspapers_cleaned.csv plus non-ISO and invalid values.
+"""
+import argparse
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+import pandas as pd
+from dateutil.parser import parse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from etl.clean_csv import normalize_dates, parse_date  # noqa: E402
+
+SEED_FILE = "data/cleaned/newspapers_cleaned.csv"
+
+# Non-ISO and invalid values mixed in so the fallback path is exercised
+EXTRA_VALUES = ["January 5, 1911", "1911/02/03", "March 1900", "not-a-date", "", None]
+
+
+def legacy_is_valid_date(date_str):
+    if pd.isna(date_str) or str(date_str).strip() == "":
+        return False
+    try:
+        parse(date_str)
+        return True
+    except Exception:
+        return False
+
+
+def timed(name, func, series):
+    start = time.perf_counter()
+    valid = func(series)
+    elapsed = time.perf_counter() - start
+    return name, elapsed, len(series) / elapsed, int(valid.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=300_000,
+                        help="rows timed for the per-row baseline (it is slow); rates are per row")
+    args = parser.parse_args()
+
+    seed = pd.read_csv(SEED_FILE, usecols=["item_date_issued"])["item_date_issued"].tolist()
+    seed += EXTRA_VALUES
+    series = pd.Series(list(islice(cycle(seed), args.rows)), dtype=object)
+    legacy_series = series.iloc[:args.legacy_rows]
+
+    parse_date.cache_clear()
+    results = [
+        timed("apply(is_valid_date) (before)", lambda s: s.apply(legacy_is_valid_date), legacy_series),
+        timed("normalize_dates (after)", lambda s: normalize_dates(s).notna(), series),
+    ]
+
+    print(f"\n--- DATE VALIDATION BENCHMARK ({len(series):,} rows) ---\n")
+    print(f"{'method':<32}{'rows':>12}{'seconds':>10}{'rows/sec':>14}")
+    for (name, elapsed, rate, _), rows in zip(results, (len(legacy_series), len(series))):
+        print(f"{name:<32}{rows:>12,}{elapsed:>10.2f}{rate:>14,.0f}")
+    print(f"\nSpeedup: {results[1][2] / results[0][2]:.1f}x")
+    print(f"dateutil calls after the ISO pass: {parse_date.cache_info().misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Fetch throughput benchmark against the local LOC stand-in server.
+
+    python -m benchmarks.bench_fetch --pages 40 --latency 0.05
+
+Reports pages/sec and records/sec for each fetch mode; nothing touches loc.gov.
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import etl.fetch_from_api as fetch_module  # noqa: E402
+from etl.loc_client import LocClient  # noqa: E402
+from etl.loc_stub_server import LocStubServer, load_seed_records  # noqa: E402
+from etl.raw_io import iter_raw_records  # noqa: E402
+from etl.response_cache import ResponseCache  # noqa: E402
+
+PERPAGE = 25
+
+
+def run_mode(name, pages, **fetch_kwargs):
+    start = time.perf_counter()
+    # fetch_from_api prints a line per page; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = fetch_module.fetch_from_api(collection=name, max_pages=pages, delay=0, **fetch_kwargs)
+    elapsed = time.perf_counter() - start
+
+    records = sum(1 for _ in iter_raw_records(path))
+    return {"mode": name, "seconds": elapsed, "pages": pages, "records": records}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds of simulated server latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    seed = load_seed_records()
+    repeat = -(-args.pages * PERPAGE // len(seed))
+    records = load_seed_records(repeat=repeat)[: args.pages * PERPAGE]
+
+    results = []
+    with tempfile.TemporaryDirectory() as raw_dir, \
+            LocStubServer(records, perpage=PERPAGE, latency=args.latency, error_rate=args.error_rate) as server:
+        fetch_module.LOC_BASE_URL = server.base_url
+        fetch_module.raw_data_saved_dir = raw_dir
+
+        results.append(run_mode("serial", args.pages))
+        for concurrency in (4, 8, 16):
+            results.append(run_mode(f"concurrent_{concurrency}", args.pages, concurrency=concurrency))
+        results.append(run_mode("concurrent_8_ndjson", args.pages, concurrency=8, output_format="ndjson"))
+
+        cache_dir = Path(raw_dir) / ".cache"
+        run_mode("cache_cold", args.pages, concurrency=8, client=LocClient(pool_size=8, cache=ResponseCache(cache_dir)))
+        results.append(run_mode("cache_warm_304", args.pages, concurrency=8,
+                                client=LocClient(pool_size=8, cache=ResponseCache(cache_dir))))
+        results.append(run_mode("cache_warm_fresh", args.pages, concurrency=8,
+                                client=LocClient(pool_size=8, cache=ResponseCache(cache_dir, max_age=3600))))
+
+    print(f"\n--- FETCH BENCHMARK ({args.pages} pages x {PERPAGE} records, latency={args.latency}s) ---\n")
+    print(f"{'mode':<22}{'seconds':>10}{'pages/sec':>12}{'records/sec':>14}")
+    for r in results:
+        print(f"{r['mode']:<22}{r['seconds']:>10.2f}{r['pages'] / r['seconds']:>12.1f}"
+              f"{r['records'] / r['seconds']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Record-extraction micro-benchmark for transform_to_csv.
+
+    python -m benchmarks.bench_transform --records 1000000
+
+Compares the per-field safe_get / safe_get_nested row building json_to_csv
+used before against the compiled FIELD_SPEC extractor, on synthetic records
+cycled from data/raw/newspapers_raw.json.
+"""
+import argparse
+import sys
+import time
+from itertools import islice, cycle
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from etl.raw_io import iter_raw_records  # noqa: E402
+from etl.transform_to_csv import extract_row, safe_get, safe_get_nested  # noqa: E402
+
+SEED_FILE = "data/raw/newspapers_raw.json"
+
+
+def legacy_row(item):
+    return {
+        "id": safe_get(item, "id"),
+        "title": safe_get(item, "title"),
+        "date": safe_get(item, "date"),
+        "description": safe_get(item, "description"),
+        "digitized": safe_get(item, "digitized"),
+        "language": safe_get(item, "language"),
+        "subject": safe_get(item, "subject"),
+        "location_city": safe_get(item, "location_city"),
+        "location_state": safe_get(item, "location_state"),
+        "location_country": safe_get(item, "location_country"),
+        "image_url": safe_get(item, "image_url").split(", ")[0]
+        if safe_get(item, "image_url")
+        else "",
+        "url": safe_get(item, "url"),
+        "item_date_issued": safe_get_nested(item, "item", "date_issued"),
+        "item_created_published": safe_get_nested(item, "item", "created_published"),
+        "item_medium": safe_get_nested(item, "item", "medium"),
+        "item_language": safe_get_nested(item, "item", "language"),
+        "item_newspaper_title": safe_get_nested(item, "item", "newspaper_title"),
+        "item_lccn": safe_get_nested(item, "item", "library_of_congress_control_number"),
+        "item_place_of_publication": safe_get_nested(item, "item", "place_of_publication"),
+    }
+
+
+def time_extractor(name, extract, records):
+    start = time.perf_counter()
+    for record in records:
+        extract(record)
+    elapsed = time.perf_counter() - start
+    return name, elapsed, len(records) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    seed = list(iter_raw_records(SEED_FILE))
+    records = list(islice(cycle(seed), args.records))
+
+    results = [
+        time_extractor("safe_get (before)", legacy_row, records),
+        time_extractor("compiled (after)", extract_row, records),
+    ]
+
+    print(f"\n--- TRANSFORM EXTRACTOR BENCHMARK ({len(records):,} records) ---\n")
+    print(f"{'extractor':<20}{'seconds':>10}{'records/sec':>14}")
+    for name, elapsed, rate in results:
+        print(f"{name:<20}{elapsed:>10.2f}{rate:>14,.0f}")
+    print(f"\nSpeedup: {results[1][2] / results[0][2]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import pandas as pd
 from google import genai
 from dotenv import load_dotenv
 import os
+from .table_io import read_table
 
 load_dotenv()
 client = genai.Client()
@@ -57,12 +58,12 @@ def ask_ai(question: str, df: pd.DataFrame) -> str:
     return response.text.strip()
 
 
-def start_ai_cli():
+def start_ai_cli(dataset_path=CLEANED_CSV):
     print("AI Data Insights Assistant Started")
-    print("Dataset loaded from:", CLEANED_CSV)
+    print("Dataset loaded from:", dataset_path)
     print("Type 'exit' to quit.\n")
 
-    df = pd.read_csv(CLEANED_CSV)
+    df = read_table(dataset_path)
 
     while True:
         user_q = input("Ask a data question: ")
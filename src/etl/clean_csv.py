@@ -1,162 +1,674 @@
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from dateutil.parser import parse
 from .logger import get_logger  
+from .profiler import DataProfile
+from .seen_ids import SeenIds
+from .transform_to_csv import LIST_FIELDS, PARQUET_TYPES
+from .table_io import (
+    TableAppender, encode_list_cell, feather, is_list_value, iter_table, list_columns, pa, read_table,
+    require_pyarrow, table_format, with_format, write_table,
+)
 
 RAW_CSV = "data/processed/newspapers.csv"      
 OUTPUT_DIR = Path("data/cleaned")
 CLEANED_FILE = OUTPUT_DIR / "newspapers_cleaned.csv"
 REJECTED_FILE = OUTPUT_DIR / "newspapers_rejected.csv"
+# Per-id content hashes from the last run, for incremental cleaning
+STATE_FILE = OUTPUT_DIR / "newspapers_clean_state.csv"
+# Data-quality profile of the cleaned rows, written next to the cleaned output
+PROFILE_SUFFIX = "_profile.json"
+
+# Bump whenever the cleaning rules change, so the next incremental run re-cleans everything
+RULES_VERSION = 2
+
+# Input position carried through parallel partitions to restore row order
+ROW_POSITION = "_row"
 
 logger = get_logger("clean_csv") 
 
-def is_valid_date(date_str):
-    if pd.isna(date_str) or str(date_str).strip() == "":
-        return False
+# Cleaning rules, shared with the fused transform+clean stage
+CRITICAL_FIELDS = [
+    "id", "title", "item_lccn", "item_date_issued", "item_newspaper_title"
+]
+
+LOCATION_FIELDS = [
+    "location_city", "location_state", "location_country"
+]
+
+FILL_UNKNOWN_FIELDS = [
+    "description", "language", "subject", "image_url",
+    "item_medium", "item_created_published",
+    "item_place_of_publication", "item_language"
+]
+
+LOWERCASE_FIELDS = [
+    "title", "description", "language", "subject",
+    "location_city", "location_state", "location_country",
+    "item_medium", "item_language",
+    "item_created_published", "item_newspaper_title",
+    "item_place_of_publication"
+]
+
+# Columns with a handful of distinct values across the whole collection, loaded
+# as categoricals. Nearly unique columns (title, lccn, subject, city) stay
+# object strings: as categoricals they would be bigger and slower.
+CATEGORICAL_COLUMNS = ["location_state", "location_country", "language", "item_language", "item_medium"]
+
+UNKNOWN = "unknown"
+# Missing multi-valued fields get no values rather than an "unknown" value, so
+# list columns keep one format: JSON-array text in CSV, lists in Parquet
+EMPTY_LIST_CELL = encode_list_cell([])
+
+# Rejection rules in evaluation order: (reason code, stats key, column).
+# A row is rejected with the reason of the first rule it fails.
+INVALID_DATE = "invalid_date"
+REJECTION_RULES = (
+    [(f"missing_{field}", "missing_critical_rows", field) for field in CRITICAL_FIELDS]
+    + [(INVALID_DATE, "invalid_date_rows", "item_date_issued")]
+    + [(f"missing_{field}", "missing_location_rows", field) for field in LOCATION_FIELDS]
+)
+REJECT_REASON_COLUMN = "reject_reason"
+
+# LOC's usual item_date_issued format; anything else falls back to dateutil
+DATE_FORMAT = "%Y-%m-%d"
+NORMALIZED_DATE_COLUMN = "item_date_normalized"
+# Fills the parts a partial date leaves out ("1894" -> 1894-01-01). dateutil
+# would otherwise take them from today, so output would depend on the run date
+PARTIAL_DATE_DEFAULT = datetime(1900, 1, 1)
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_date(date_str):
+    """
+    Parse one date string with dateutil, memoized since dates repeat heavily.
+    Returns it as YYYY-MM-DD, or None if it does not parse.
+    """
     try:
-        parse(date_str)
-        return True
+        return parse(date_str, default=PARTIAL_DATE_DEFAULT).strftime(DATE_FORMAT)
     except Exception:
-        return False
-    
-def clean_newspapers_csv():
-    logger.info("Starting cleaning process for RAW CSV.")
-    print("\n--- CLEANING NEWSPAPERS CSV ---\n")
+        return None
 
-    # Load data
-    try:
-        df = pd.read_csv(RAW_CSV)
-        logger.info(f"Loaded raw CSV '{RAW_CSV}' with {len(df)} rows.")
-    except Exception as e:
-        logger.error(f"Failed to load raw CSV: {e}")
-        raise
 
-    original_count = len(df)
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def normalize_date(value):
+    if pd.isna(value) or str(value).strip() == "":
+        return None
+    return parse_date(value)
 
-    # Track stats
-    stats = {
+
+def normalize_dates(series):
+    """
+    Vectorized normalize_date. Dates repeat heavily, so only the distinct values
+    are converted: one pd.to_datetime pass for ISO dates, then dateutil for the
+    strings that pass missed.
+    Returns YYYY-MM-DD strings, with None where the date is missing or invalid.
+    """
+    codes, distinct = pd.factorize(series)
+    distinct = pd.Series(distinct, dtype=object)
+
+    normalized = pd.to_datetime(distinct, format=DATE_FORMAT, errors="coerce").dt.strftime(DATE_FORMAT)
+    normalized = normalized.astype(object)
+
+    leftover = normalized.isna()
+    if leftover.any():
+        normalized[leftover] = distinct[leftover].map(normalize_date)
+
+    # Missing values factorize to -1; append a None slot for them
+    values = np.append(normalized.to_numpy(dtype=object), None)
+    return pd.Series(values[codes], index=series.index, dtype=object)
+
+
+def is_valid_date(date_str):
+    return normalize_date(date_str) is not None
+
+
+def is_blank(value):
+    """
+    Row-level twin of the `isna() | strip() == ""` masks used on DataFrames.
+    """
+    return value is None or (isinstance(value, float) and pd.isna(value)) or str(value).strip() == ""
+
+
+def is_categorical(series):
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def blank_mask(series):
+    if is_categorical(series):
+        # Test each distinct value once instead of every row
+        categories = series.cat.categories
+        blank = categories[categories.astype(str).str.strip() == ""]
+        return series.isna() | series.isin(blank)
+    return series.isna() | (series.astype(str).str.strip() == "")
+
+
+def fill_categorical(series, mask, value):
+    if value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    series = series.copy()
+    series[mask] = value
+    return series.cat.remove_unused_categories()
+
+
+def lowercase_categorical(series):
+    """
+    Lowercase each category once, merging categories that collide
+    (e.g. "Alaska" and "alaska"), then remap the integer codes.
+    """
+    lowered = pd.Index(series.cat.categories.astype(str).str.lower())
+    merged = lowered.unique()
+    remap = np.append(merged.get_indexer(lowered), -1)
+    return pd.Series(pd.Categorical.from_codes(remap[series.cat.codes], merged), index=series.index)
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def object_memory_mb(df):
+    """
+    What the frame would take with categoricals held as object strings:
+    one pointer per row plus each row's string, computed per category.
+    """
+    total = 0
+    for column in df.columns:
+        series = df[column]
+        if is_categorical(series):
+            sizes = np.append(series.cat.categories.map(sys.getsizeof).to_numpy(dtype=np.int64),
+                              sys.getsizeof(np.nan))
+            total += 8 * len(series) + sizes[series.cat.codes].sum()
+        else:
+            total += series.memory_usage(deep=True, index=False)
+    return (total + df.index.memory_usage()) / 1e6
+
+
+def rejection_reasons(df, normalized_dates):
+    """
+    Evaluate every rejection rule in one pass over the frame.
+    Returns a Series holding each row's first failing reason code, or None.
+    Only one rule mask is alive at a time, so memory does not grow with the rules.
+    """
+    reasons = pd.Series(None, index=df.index, dtype=object)
+
+    for reason, _, field in REJECTION_RULES:
+        failed = normalized_dates.isna() if reason == INVALID_DATE else blank_mask(df[field])
+        reasons[failed & reasons.isna()] = reason
+
+    return reasons
+
+
+def lowercase_value(value):
+    if is_list_value(value):
+        return [str(v).lower() for v in value]
+    return str(value).lower()
+
+
+def new_stats():
+    return {
         "invalid_date_rows": 0,
         "missing_critical_rows": 0,
         "missing_location_rows": 0,
         "placeholder_fills": {},
-        "lowercase_ops": {}
+        "lowercase_ops": {},
+        "reject_reasons": {}
     }
 
-    critical_fields = [
-        "id", "title", "item_lccn", "item_date_issued", "item_newspaper_title"
-    ]
 
-    location_fields = [
-        "location_city", "location_state", "location_country"
-    ]
+def print_summary(original_count, removed_duplicates, rejected_count, final_count, stats,
+                  cleaned_file, rejected_file):
+    print("\n--- CLEANING SUMMARY ---")
+    print(f"Rows before cleaning: {original_count}")
+    print(f"Duplicates removed:  {removed_duplicates}")
+    print(f"Rows rejected:       {rejected_count}")
+    print(f"Rows after cleaning: {final_count}\n")
 
-    non_critical_fill_unknown = [
-        "description", "language", "subject", "image_url",
-        "item_medium", "item_created_published",
-        "item_place_of_publication", "item_language"
-    ]
+    print("Reasons for rejection:")
+    print(f"  Missing critical fields: {stats['missing_critical_rows']}")
+    print(f"  Invalid date formats:    {stats['invalid_date_rows']}")
+    print(f"  Missing location fields: {stats['missing_location_rows']}\n")
+
+    print("Placeholder fills:")
+    for field, count in stats["placeholder_fills"].items():
+        print(f"  {field}: {count}")
 
-    lowercase_fields = [
-        "title", "description", "language", "subject",
-        "location_city", "location_state", "location_country",
-        "item_medium", "item_language",
-        "item_created_published", "item_newspaper_title",
-        "item_place_of_publication"
-    ]
+    print("\nLowercase operations:")
+    for field, count in stats["lowercase_ops"].items():
+        print(f"  {field}: {count}")
+
+    print(f"\nCleaned CSV saved to:  {cleaned_file}")
+    print(f"Rejected CSV saved to: {rejected_file}")
+
+
+def clean_frame(df, stats, multi_valued=()):
+    """
+    Apply the rejection rules, placeholder fills and lowercasing to one frame
+    (the whole table or a single chunk), adding its counts to `stats`.
+    @param multi_valued: columns holding lists rather than joined text
+    Returns (cleaned rows, rejected rows).
+    """
+    # Evaluate the rejection rules (critical fields, date, location) in one pass
+    normalized_dates = normalize_dates(df["item_date_issued"])
+    reasons = rejection_reasons(df, normalized_dates)
+    rejected_mask = reasons.notna()
+
+    reason_counts = reasons.value_counts()
+    for reason, stats_key, _ in REJECTION_RULES:
+        count = int(reason_counts.get(reason, 0))
+        stats[stats_key] += count
+        if count:
+            stats["reject_reasons"][reason] = stats["reject_reasons"].get(reason, 0) + count
+
+    # Split clean and rejected rows once
+    rejected_rows = df[rejected_mask].assign(**{REJECT_REASON_COLUMN: reasons[rejected_mask]})
+    df = df[~rejected_mask]
+
+    # Kept rows carry their date as YYYY-MM-DD
+    df = df.assign(**{NORMALIZED_DATE_COLUMN: normalized_dates[~rejected_mask]})
+
+    # Fill non-critical missing fields with "unknown", list fields with an empty list
+    for field in FILL_UNKNOWN_FIELDS:
+        mask = blank_mask(df[field])
+        fill_count = mask.sum()
+        if fill_count > 0:
+            stats["placeholder_fills"][field] = stats["placeholder_fills"].get(field, 0) + fill_count
+            placeholder = EMPTY_LIST_CELL if field in LIST_FIELDS else UNKNOWN
+            if field in multi_valued:
+                df[field] = [[] if missing else value for value, missing in zip(df[field], mask)]
+            elif is_categorical(df[field]):
+                df[field] = fill_categorical(df[field], mask, placeholder)
+            else:
+                df.loc[mask, field] = placeholder
 
+    # Lowercase fields
+    for field in LOWERCASE_FIELDS:
+        mask = df[field].notna()
+        if field in multi_valued:
+            df[field] = [lowercase_value(value) if present else value for value, present in zip(df[field], mask)]
+        elif is_categorical(df[field]):
+            df[field] = lowercase_categorical(df[field])
+        else:
+            df.loc[mask, field] = df.loc[mask, field].astype(str).str.lower()
+        stats["lowercase_ops"][field] = stats["lowercase_ops"].get(field, 0) + mask.sum()
+
+    return df, rejected_rows
+
+
+def log_stats(stats):
+    for reason, count in stats["reject_reasons"].items():
+        logger.info(f"Rejected {count} rows for '{reason}'.")
+    for field, count in stats["placeholder_fills"].items():
+        placeholder = EMPTY_LIST_CELL if field in LIST_FIELDS else UNKNOWN
+        logger.info(f"Filled {count} missing '{field}' fields with '{placeholder}'.")
+    for field, count in stats["lowercase_ops"].items():
+        logger.info(f"Applied lowercase operation on {count} values for '{field}'.")
+
+
+def categorical_columns(multi_valued=()):
+    """
+    CATEGORICAL_COLUMNS to load as categoricals, so fills and lowercasing run
+    once per distinct value. List-valued columns can't be categorical.
+    """
+    return [c for c in CATEGORICAL_COLUMNS if c not in multi_valued]
+
+
+def clean_in_memory(input_path, cleaned_file, rejected_file, stats, multi_valued, profile=None):
+    """
+    Clean the whole table as one DataFrame.
+    Returns (rows before, duplicates removed, rows rejected, rows kept).
+    """
+    try:
+        df = read_table(input_path, categories=categorical_columns(multi_valued))
+        logger.info(f"Loaded raw CSV '{input_path}' with {len(df)} rows.")
+        logger.info(f"Frame memory: {object_memory_mb(df):.1f} MB as object strings, "
+                    f"{memory_mb(df):.1f} MB with categoricals.")
+    except Exception as e:
+        logger.error(f"Failed to load raw CSV: {e}")
+        raise
+
+    original_count = len(df)
     print(f"Rows before cleaning: {original_count}")
     logger.info(f"Rows before cleaning: {original_count}")
 
-    # 1. Remove duplicate IDs
+    # Remove duplicate IDs
+    df = df.drop_duplicates(subset=["id"])
+    removed_duplicates = original_count - len(df)
+    logger.info(f"Removed {removed_duplicates} duplicate ID rows.")
+
+    df, rejected_rows = clean_frame(df, stats, multi_valued)
+    logger.info(f"Cleaned frame uses {memory_mb(df):.1f} MB, rejected frame {memory_mb(rejected_rows):.1f} MB.")
+    if profile is not None:
+        profile.update(df)
+
+    try:
+        write_table(df, cleaned_file)
+        write_table(rejected_rows, rejected_file)
+    except Exception as e:
+        logger.error(f"Failed to save cleaned or rejected CSVs: {e}")
+        raise
+
+    return original_count, removed_duplicates, len(rejected_rows), len(df)
+
+
+def row_hashes(df, multi_valued=()):
+    """
+    64-bit content hash per row over every column, stored as int64 so it
+    round-trips through CSV. List cells are joined first since arrays aren't hashable.
+    """
+    hashable = df.assign(**{
+        column: df[column].map(lambda v: "\x1f".join(map(str, v)) if is_list_value(v) else v)
+        for column in multi_valued if column in df.columns
+    })
+    return pd.util.hash_pandas_object(hashable, index=False).to_numpy().view(np.int64)
+
+
+def load_state(state_file):
+    """
+    Previous run's {id: row hash}, or None if there is no usable state
+    (missing, unreadable, or written under a different RULES_VERSION).
+    """
+    try:
+        state = read_table(state_file)
+    except (OSError, ValueError) as e:
+        logger.info(f"No clean state at {state_file} ({e}); running a full clean.")
+        return None
+
+    if len(state) and int(state["rules_version"].iloc[0]) != RULES_VERSION:
+        logger.info(f"Clean state is for rules v{state['rules_version'].iloc[0]}, "
+                    f"current is v{RULES_VERSION}; running a full clean.")
+        return None
+
+    return pd.Series(state["row_hash"].to_numpy(), index=state["id"], dtype="Int64")
+
+
+def save_state(df, hashes, state_file):
+    state = pd.DataFrame({"id": df["id"].to_numpy(), "row_hash": hashes, "rules_version": RULES_VERSION})
+    write_table(state, state_file)
+    logger.info(f"Saved clean state for {len(state)} ids → {state_file}")
+
+
+def clean_incrementally(input_path, cleaned_file, rejected_file, stats, multi_valued, profile=None):
+    """
+    Re-run the rules only on rows whose content hash changed since the last
+    run, and merge them into the existing cleaned and rejected outputs.
+    Falls back to a full clean when there is no state for the current
+    RULES_VERSION or an output is missing. Stats cover re-cleaned rows only.
+    Returns (rows before, duplicates removed, rows rejected, rows kept).
+    """
+    state_file = with_format(STATE_FILE, table_format(cleaned_file))
+
+    df = read_table(input_path, categories=categorical_columns(multi_valued))
+    original_count = len(df)
+    print(f"Rows before cleaning: {original_count}")
+    logger.info(f"Rows before cleaning: {original_count}")
+
+    df = df.drop_duplicates(subset=["id"])
+    removed_duplicates = original_count - len(df)
+    logger.info(f"Removed {removed_duplicates} duplicate ID rows.")
+
+    hashes = row_hashes(df, multi_valued)
+    previous = load_state(state_file)
+    if previous is not None and not (Path(cleaned_file).exists() and Path(rejected_file).exists()):
+        logger.info("Cleaned or rejected output is missing; running a full clean.")
+        previous = None
+
+    if previous is None:
+        cleaned_rows, rejected_rows = clean_frame(df, stats, multi_valued)
+    else:
+        unchanged = (df["id"].map(previous) == hashes).fillna(False).to_numpy(dtype=bool)
+        unchanged_ids = df["id"][unchanged]
+        print(f"Re-cleaning {(~unchanged).sum()} new or changed rows ({unchanged.sum()} unchanged).")
+        logger.info(f"Incremental clean: {(~unchanged).sum()} new or changed rows, {unchanged.sum()} unchanged.")
+
+        cleaned_new, rejected_new = clean_frame(df[~unchanged], stats, multi_valued)
+
+        # Keep earlier results for unchanged ids; ids gone from the input drop out
+        cleaned_old = read_table(cleaned_file)
+        rejected_old = read_table(rejected_file)
+        position = pd.Series(np.arange(len(df)), index=df["id"])
+
+        def merge(old, new):
+            parts = [part for part in (old[old["id"].isin(unchanged_ids)], new) if len(part)]
+            merged = pd.concat(parts, ignore_index=True) if parts else old.iloc[:0]
+            order = merged["id"].map(position).to_numpy()
+            return merged.iloc[np.argsort(order, kind="stable")].reset_index(drop=True)
+
+        cleaned_rows = merge(cleaned_old, cleaned_new)
+        rejected_rows = merge(rejected_old, rejected_new)
+
+    if profile is not None:
+        profile.update(cleaned_rows)
+
+    try:
+        write_table(cleaned_rows, cleaned_file)
+        write_table(rejected_rows, rejected_file)
+    except Exception as e:
+        logger.error(f"Failed to save cleaned or rejected CSVs: {e}")
+        raise
+
+    save_state(df, hashes, state_file)
+
+    return original_count, removed_duplicates, len(rejected_rows), len(cleaned_rows)
+
+
+def clean_partition(partition_path, multi_valued):
+    """
+    Process-pool worker: dedupe and clean one id-hash partition read from an
+    Arrow file, writing the results next to it as Arrow files.
+    Returns (duplicates removed, stats) - only small values cross the pool.
+    """
+    df = feather.read_table(partition_path, memory_map=True).to_pandas()
+
     before = len(df)
     df = df.drop_duplicates(subset=["id"])
     removed_duplicates = before - len(df)
-    logger.info(f"Removed {removed_duplicates} duplicate ID rows.")
 
-    # 2. Reject missing CRITICAL fields
-    rejected_rows = pd.DataFrame(columns=df.columns)
-
-    for field in critical_fields:
-        missing_mask = df[field].isna() | (df[field].astype(str).str.strip() == "")
-        if missing_mask.any():
-            reject_chunk = df[missing_mask]
-            rejected_rows = pd.concat([rejected_rows, reject_chunk], ignore_index=True)
-            count = len(reject_chunk)
-            stats["missing_critical_rows"] += count
-            df = df[~missing_mask]
-            logger.info(f"Rejected {count} rows missing critical field '{field}'.")
-
-    # 3. Reject invalid dates
-    invalid_date_mask = ~df["item_date_issued"].apply(is_valid_date)
-    if invalid_date_mask.any():
-        reject_chunk = df[invalid_date_mask]
-        rejected_rows = pd.concat([rejected_rows, reject_chunk], ignore_index=True)
-        count = len(reject_chunk)
-        stats["invalid_date_rows"] += count
-        df = df[~invalid_date_mask]
-        logger.info(f"Rejected {count} rows with invalid date formats.")
-
-    # 4. Reject rows missing location fields
-    for loc_field in location_fields:
-        missing_mask = df[loc_field].isna() | (df[loc_field].astype(str).str.strip() == "")
-        if missing_mask.any():
-            reject_chunk = df[missing_mask]
-            rejected_rows = pd.concat([rejected_rows, reject_chunk], ignore_index=True)
-            count = len(reject_chunk)
-            stats["missing_location_rows"] += count
-            df = df[~missing_mask]
-            logger.info(f"Rejected {count} rows missing location field '{loc_field}'.")
-
-    # 5. Fill non-critical missing fields with "unknown"
-    for field in non_critical_fill_unknown:
-        mask = df[field].isna() | (df[field].astype(str).str.strip() == "")
-        fill_count = mask.sum()
-        if fill_count > 0:
-            stats["placeholder_fills"][field] = fill_count
-            df.loc[mask, field] = "unknown"
-            logger.info(f"Filled {fill_count} missing '{field}' fields with 'unknown'.")
+    stats = new_stats()
+    cleaned_rows, rejected_rows = clean_frame(df, stats, multi_valued)
+
+    for name, frame in (("cleaned", cleaned_rows), ("rejected", rejected_rows)):
+        table = pa.Table.from_pandas(frame.reset_index(drop=True), preserve_index=False)
+        feather.write_feather(table, f"{partition_path}.{name}", compression="uncompressed")
+
+    return removed_duplicates, stats
+
+
+def merge_stats(stats, partial):
+    for key in ("invalid_date_rows", "missing_critical_rows", "missing_location_rows"):
+        stats[key] += partial[key]
+    for key in ("placeholder_fills", "lowercase_ops", "reject_reasons"):
+        for name, count in partial[key].items():
+            stats[key][name] = stats[key].get(name, 0) + count
+
+
+def order_stats(stats):
+    """
+    Put merged per-field stats back in the order the serial path reports them.
+    """
+    rule_order = {
+        "placeholder_fills": FILL_UNKNOWN_FIELDS,
+        "lowercase_ops": LOWERCASE_FIELDS,
+        "reject_reasons": [reason for reason, _, _ in REJECTION_RULES],
+    }
+    for key, order in rule_order.items():
+        stats[key] = {name: stats[key][name] for name in order if name in stats[key]}
+
+
+def read_partitions(paths):
+    frames = [feather.read_table(path).to_pandas() for path in paths]
+    frames = [frame for frame in frames if len(frame)] or frames[:1]
+    merged = pd.concat(frames, ignore_index=True)
+    # Restore input order so the result matches the serial path exactly
+    merged = merged.sort_values(ROW_POSITION, kind="stable")
+    return merged.drop(columns=ROW_POSITION).reset_index(drop=True)
 
-    # 6. Lowercase fields
-    for field in lowercase_fields:
-        mask = df[field].notna()
-        df.loc[mask, field] = df.loc[mask, field].astype(str).str.lower()
-        stats["lowercase_ops"][field] = mask.sum()
-        logger.info(f"Applied lowercase operation on {mask.sum()} values for '{field}'.")
 
-    # 7. Save outputs
+def clean_in_parallel(input_path, cleaned_file, rejected_file, stats, multi_valued, workers, profile=None):
+    """
+    Hash-partition the table by id and clean the partitions in a process pool.
+    Duplicate ids always share a partition, so per-partition dedup matches
+    the global one. Partitions and results are handed over as uncompressed
+    Arrow files that workers memory-map, rather than pickled DataFrames.
+    Returns (rows before, duplicates removed, rows rejected, rows kept).
+    """
+    require_pyarrow()
+
+    df = read_table(input_path, categories=categorical_columns(multi_valued))
+    original_count = len(df)
+    print(f"Rows before cleaning: {original_count}")
+    logger.info(f"Rows before cleaning: {original_count}")
+
+    df = df.reset_index(drop=True)
+    df[ROW_POSITION] = np.arange(len(df))
+    partition = pd.util.hash_pandas_object(df["id"].astype(str), index=False).to_numpy() % workers
+
+    removed_duplicates = 0
+    with tempfile.TemporaryDirectory(prefix="clean_partitions_") as tmp_dir:
+        paths = []
+        for i in range(workers):
+            path = os.path.join(tmp_dir, f"part_{i:04d}.arrow")
+            table = pa.Table.from_pandas(df[partition == i], preserve_index=False)
+            feather.write_feather(table, path, compression="uncompressed")
+            paths.append(path)
+        del df
+
+        logger.info(f"Cleaning {workers} id-hash partitions in parallel.")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(clean_partition, path, multi_valued) for path in paths]
+            # Collected in partition order so stats merge deterministically
+            for future in futures:
+                removed, partial = future.result()
+                removed_duplicates += removed
+                merge_stats(stats, partial)
+
+        cleaned_rows = read_partitions([f"{path}.cleaned" for path in paths])
+        rejected_rows = read_partitions([f"{path}.rejected" for path in paths])
+
+    order_stats(stats)
+    logger.info(f"Removed {removed_duplicates} duplicate ID rows.")
+    if profile is not None:
+        profile.update(cleaned_rows)
+
     try:
-        df.to_csv(CLEANED_FILE, index=False)
-        rejected_rows.to_csv(REJECTED_FILE, index=False)
-        logger.info(f"Saved cleaned CSV → {CLEANED_FILE}")
-        logger.info(f"Saved rejected CSV → {REJECTED_FILE}")
+        write_table(cleaned_rows, cleaned_file)
+        write_table(rejected_rows, rejected_file)
     except Exception as e:
         logger.error(f"Failed to save cleaned or rejected CSVs: {e}")
         raise
 
-    final_count = len(df)
+    return original_count, removed_duplicates, len(rejected_rows), len(cleaned_rows)
+
+
+def clean_in_chunks(input_path, chunksize, cleaned_file, rejected_file, stats, multi_valued, profile=None):
+    """
+    Stream the table through clean_frame `chunksize` rows at a time, appending
+    to the outputs. A SeenIds index keeps deduplication global across chunks.
+    Returns (rows before, duplicates removed, rows rejected, rows kept).
+    """
+    seen_ids = SeenIds()
+    # Output types are fixed up front; any chunk may have a column that is blank throughout
+    scalar_types = {c: t for c, t in PARQUET_TYPES.items() if c not in LIST_FIELDS}
+    original_count = removed_duplicates = rejected_count = final_count = 0
+
+    try:
+        with TableAppender(cleaned_file, multi_valued, scalar_types) as cleaned_out, \
+                TableAppender(rejected_file, multi_valued, scalar_types) as rejected_out:
+            for chunk in iter_table(input_path, chunksize, categories=categorical_columns(multi_valued)):
+                original_count += len(chunk)
+
+                first_seen = seen_ids.first_seen(chunk["id"])
+                removed_duplicates += int((~first_seen).sum())
+                chunk = chunk[first_seen]
+
+                cleaned_rows, rejected_rows = clean_frame(chunk, stats, multi_valued)
+                cleaned_out.append(cleaned_rows)
+                if profile is not None:
+                    profile.update(cleaned_rows)
+                rejected_out.append(rejected_rows)
+                rejected_count += len(rejected_rows)
+                final_count += len(cleaned_rows)
+
+                logger.info(f"Cleaned chunk: {original_count} rows read, {len(seen_ids)} distinct ids so far.")
+    except Exception as e:
+        logger.error(f"Chunked cleaning failed for '{input_path}': {e}")
+        raise
 
-    # 8. Print summary
-    print("\n--- CLEANING SUMMARY ---")
     print(f"Rows before cleaning: {original_count}")
-    print(f"Duplicates removed:  {removed_duplicates}")
-    print(f"Rows rejected:       {len(rejected_rows)}")
-    print(f"Rows after cleaning: {final_count}\n")
+    logger.info(f"Rows before cleaning: {original_count}")
+    logger.info(f"Removed {removed_duplicates} duplicate ID rows.")
+    if seen_ids.collisions:
+        logger.warning(f"{seen_ids.collisions} distinct id(s) collided on their dedup key hash and were kept.")
 
-    print("Reasons for rejection:")
-    print(f"  Missing critical fields: {stats['missing_critical_rows']}")
-    print(f"  Invalid date formats:    {stats['invalid_date_rows']}")
-    print(f"  Missing location fields: {stats['missing_location_rows']}\n")
+    return original_count, removed_duplicates, rejected_count, final_count
 
-    print("Placeholder fills:")
-    for field, count in stats["placeholder_fills"].items():
-        print(f"  {field}: {count}")
 
-    print("\nLowercase operations:")
-    for field, count in stats["lowercase_ops"].items():
-        print(f"  {field}: {count}")
+def profile_path(cleaned_file):
+    """
+    newspapers_cleaned.csv -> newspapers_cleaned_profile.json
+    """
+    cleaned_file = Path(cleaned_file)
+    return cleaned_file.with_name(cleaned_file.stem + PROFILE_SUFFIX)
+
 
-    print(f"\nCleaned CSV saved to:  {CLEANED_FILE}")
-    print(f"Rejected CSV saved to: {REJECTED_FILE}")
+def clean_newspapers_csv(input_path=None, output_format="csv", chunksize=None, incremental=False,
+                         workers=None, profile=True):
+    """
+    Validate and standardize the processed table.
+    @param input_path: processed CSV or Parquet file (defaults to RAW_CSV)
+    @param output_format: "csv" or "parquet" for the cleaned + rejected outputs
+    @param chunksize: stream the input this many rows at a time instead of
+                      loading it whole, for tables that don't fit in memory
+    @param incremental: only re-clean rows whose content changed since the
+                        last incremental run (see STATE_FILE / RULES_VERSION)
+    @param workers: clean id-hash partitions across this many processes
+    @param profile: sketch null rates, distinct counts, top values and lengths
+                    of the cleaned rows and write them to a JSON profile
+    Returns the cleaned output path.
+    """
+    if sum(bool(mode) for mode in (chunksize, incremental, workers)) > 1:
+        raise ValueError("chunksize, incremental and workers are separate cleaning modes; pick one")
+
+    logger.info("Starting cleaning process for RAW CSV.")
+    print("\n--- CLEANING NEWSPAPERS CSV ---\n")
+
+    input_path = input_path or RAW_CSV
+    cleaned_file = with_format(CLEANED_FILE, output_format)
+    rejected_file = with_format(REJECTED_FILE, output_format)
+
+    # Multi-valued columns read from Parquet hold arrays rather than joined text
+    multi_valued = list_columns(input_path)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Track stats
+    stats = new_stats()
+    data_profile = DataProfile() if profile else None
+
+    if incremental:
+        counts = clean_incrementally(input_path, cleaned_file, rejected_file, stats, multi_valued, data_profile)
+    elif workers:
+        counts = clean_in_parallel(input_path, cleaned_file, rejected_file, stats, multi_valued, workers, data_profile)
+    elif chunksize:
+        counts = clean_in_chunks(input_path, chunksize, cleaned_file, rejected_file, stats, multi_valued, data_profile)
+    else:
+        counts = clean_in_memory(input_path, cleaned_file, rejected_file, stats, multi_valued, data_profile)
+
+    log_stats(stats)
+    logger.info(f"Saved cleaned CSV → {cleaned_file}")
+    logger.info(f"Saved rejected CSV → {rejected_file}")
+    if data_profile is not None:
+        data_profile.write(profile_path(cleaned_file))
+
+    # Print summary
+    original_count, removed_duplicates, rejected_count, final_count = counts
+    print_summary(original_count, removed_duplicates, rejected_count, final_count,
+                  stats, cleaned_file, rejected_file)
 
     logger.info("Cleaning pipeline completed successfully.")
+
+    return cleaned_file
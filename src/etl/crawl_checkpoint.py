@@ -0,0 +1,105 @@
+import json
+import os
+import re
+import shutil
+import threading
+
+from .logger import get_logger
+from .raw_io import iter_raw_records, open_raw, write_ndjson_records
+
+STATE_FILE = "checkpoint.json"
+PAGE_FILE_RE = re.compile(r"^page_(\d+)\.ndjson$")
+
+logger = get_logger("crawl_checkpoint")
+
+
+def write_atomic(path, write):
+    """
+    Write a file via a temp file + rename so a crash never leaves half a page on disk.
+    """
+    tmp_path = f"{path}.tmp"
+    with open_raw(tmp_path, "w") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class CrawlCheckpoint:
+    """
+    On-disk progress for one crawl.
+    Every completed page is saved as its own NDJSON file next to a small
+    state file holding the page count and the `next` cursor of each page,
+    so a rerun can serve finished pages from disk and only request the rest.
+    Call clear() once the crawl's output is written so the next run starts fresh.
+    """
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.state = self.load_state()
+
+    @property
+    def state_path(self):
+        return os.path.join(self.directory, STATE_FILE)
+
+    def page_path(self, page):
+        return os.path.join(self.directory, f"page_{page:05d}.ndjson")
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {"total_pages": None, "next": {}}
+
+        with open(self.state_path, "r") as f:
+            state = json.load(f)
+        logger.info(f"Loaded crawl checkpoint from {self.state_path}")
+        return state
+
+    @property
+    def total_pages(self):
+        return self.state.get("total_pages")
+
+    def completed_pages(self):
+        pages = set()
+        for name in os.listdir(self.directory):
+            match = PAGE_FILE_RE.match(name)
+            if match:
+                pages.add(int(match.group(1)))
+        return pages
+
+    def completed_through(self):
+        """
+        Highest page N such that pages 1..N are all on disk.
+        """
+        done = self.completed_pages()
+        page = 0
+        while page + 1 in done:
+            page += 1
+        return page
+
+    def next_url(self, page):
+        return self.state["next"].get(str(page))
+
+    def has_page(self, page):
+        return os.path.exists(self.page_path(page))
+
+    def load_page(self, page):
+        return list(iter_raw_records(self.page_path(page)))
+
+    def save_page(self, page, results, next_url=None, total_pages=None):
+        # Page file first: the state never points past data that isn't on disk
+        write_atomic(self.page_path(page), lambda f: write_ndjson_records(f, results))
+
+        with self.lock:
+            self.state["next"][str(page)] = next_url
+            if total_pages is not None:
+                self.state["total_pages"] = int(total_pages)
+            write_atomic(self.state_path, lambda f: json.dump(self.state, f))
+
+        logger.info(f"Checkpointed page {page} ({len(results)} results)")
+
+    def clear(self):
+        """
+        Delete the checkpoint directory after a completed crawl.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        logger.info(f"Crawl complete; removed checkpoint {self.directory}")
@@ -1,4 +1,5 @@
 import psycopg2
+from . import queries
 from .logger import get_logger   # <-- added
 
 DB_NAME = "newspapers"
@@ -26,20 +27,29 @@ def connect():
         logger.error(f"Database connection failed: {e}")
         raise
 
-def create_tables():
-    logger.info("Starting table drop + recreate process...")
+# Every table this schema owns, children first, for an explicit rebuild
+TABLES = [
+    "issue_subjects", "subjects", "issue_languages", "languages",
+    "issues", "locations", "newspapers",
+]
 
-    drop_commands = [
-        "DROP TABLE IF EXISTS issue_subjects CASCADE;",
-        "DROP TABLE IF EXISTS subjects CASCADE;",
-        "DROP TABLE IF EXISTS issue_languages CASCADE;",
-        "DROP TABLE IF EXISTS languages CASCADE;",
-        "DROP TABLE IF EXISTS issues CASCADE;",
-        "DROP TABLE IF EXISTS locations CASCADE;",
-        "DROP TABLE IF EXISTS newspapers CASCADE;"
-    ]
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
 
-    create_commands = [
+# Arbitrary key for pg_advisory_xact_lock, so concurrent runs migrate one at a time
+MIGRATION_LOCK_ID = 52_000_001
+
+# Ordered, append-only list of (version, description, statements).
+# Never edit a released migration; add a new version instead.
+# Statements are idempotent, so databases created by the old
+# drop-and-recreate setup are adopted as version 1 without changes.
+MIGRATIONS = [
+    (1, "initial schema", [
 
         # newspapers
         """
@@ -108,42 +118,204 @@ def create_tables():
             PRIMARY KEY (issue_id, subject_id)
         );
         """
-    ]
+    ]),
+
+    (2, "natural-key constraints and foreign-key / date indexes", [
+
+        # Point issues at the lowest location_id of each duplicate location group,
+        # then drop the duplicates so the unique constraint can be added
+        """
+        UPDATE issues i
+        SET location_id = d.keep_id
+        FROM (
+            SELECT location_id,
+                   MIN(location_id) OVER (PARTITION BY city, state, country) AS keep_id
+            FROM locations
+        ) d
+        WHERE i.location_id = d.location_id
+          AND d.location_id <> d.keep_id;
+        """,
+        """
+        DELETE FROM locations l
+        USING locations k
+        WHERE l.city = k.city AND l.state = k.state AND l.country = k.country
+          AND l.location_id > k.location_id;
+        """,
+        """
+        ALTER TABLE locations
+        ADD CONSTRAINT locations_city_state_country_key UNIQUE (city, state, country);
+        """,
+
+        # Foreign keys and the date used by charts and range filters
+        "CREATE INDEX IF NOT EXISTS issues_date_issued_idx ON issues (date_issued);",
+        "CREATE INDEX IF NOT EXISTS issues_newspaper_id_idx ON issues (newspaper_id);",
+        "CREATE INDEX IF NOT EXISTS issues_location_id_idx ON issues (location_id);",
+
+        # Junction primary keys lead with issue_id; these cover lookups from the other side
+        "CREATE INDEX IF NOT EXISTS issue_languages_language_id_idx ON issue_languages (language_id);",
+        "CREATE INDEX IF NOT EXISTS issue_subjects_subject_id_idx ON issue_subjects (subject_id);",
+    ]),
+]
 
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# Statements the loader runs once per row, with sample parameters.
+# Each should be answerable from an index; see check_hot_query_indexes().
+HOT_QUERIES = {
+    "upsert newspaper": (queries.UPSERT_NEWSPAPER_SQL, ("sn0", "daily news")),
+    "insert location": (queries.INSERT_LOCATION_SQL, ("juneau", "alaska", "united states")),
+    "newspaper by lccn": (queries.NEWSPAPER_ID_SQL, ("sn0",)),
+    "location by natural key": (queries.LOCATION_ID_SQL, ("juneau", "alaska", "united states")),
+    "upsert issue": (
+        queries.UPSERT_ISSUE_SQL,
+        ("id", "1900-01-01", "title", "medium", "image_url", "url", 1, 1),
+    ),
+    "issue by loc id": (queries.ISSUE_ID_SQL, ("id",)),
+    "clear issue languages": (queries.DELETE_ISSUE_LANGUAGES_SQL, ([1],)),
+    "clear issue subjects": (queries.DELETE_ISSUE_SUBJECTS_SQL, ([1],)),
+    "insert language": (queries.INSERT_LANGUAGE_SQL, ("english",)),
+    "language by name": (queries.LANGUAGE_ID_SQL, ("english",)),
+    "link issue language": (queries.INSERT_ISSUE_LANGUAGE_SQL, (1, 1)),
+    "insert subject": (queries.INSERT_SUBJECT_SQL, ("news",)),
+    "subject by name": (queries.SUBJECT_ID_SQL, ("news",)),
+    "link issue subject": (queries.INSERT_ISSUE_SUBJECT_SQL, (1, 1)),
+}
+
+# The make_charts aggregates read whole tables, so a full scan is expected;
+# EXPLAINing them still checks they plan against the migrated schema.
+CHART_QUERIES = {
+    "issues per year": (queries.ISSUES_PER_YEAR_SQL, None),
+    "issues per state": (queries.ISSUES_PER_STATE_SQL, None),
+    "language frequency": (queries.LANGUAGE_FREQUENCY_SQL, None),
+    "pages per issue": (queries.PAGES_PER_ISSUE_SQL, None),
+}
+
+
+def seq_scanned_tables(plan):
+    """
+    Tables read by a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan node.
+    """
+    tables = [plan["Relation Name"]] if plan.get("Node Type") == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        tables += seq_scanned_tables(child)
+    return tables
+
+
+def check_hot_query_indexes(statements=None):
+    """
+    EXPLAIN every HOT_QUERIES entry with sequential scans disabled. The planner
+    still picks a Seq Scan when no usable index exists, so any that remain
+    mark a missing index. Table size doesn't matter, so this works on an
+    empty database.
+    @param statements: {name: (sql, params)} to check instead, e.g. CHART_QUERIES
+    Returns {query name: [tables scanned sequentially]}, empty lists when indexed.
+    """
+    statements = HOT_QUERIES if statements is None else statements
+    conn = connect()
+    cur = conn.cursor()
+
+    results = {}
     try:
-        conn = connect()
-        cur = conn.cursor()
-    except Exception:
-        logger.error("Could not initialize cursor/connection for table creation.")
-        raise
+        cur.execute("SET LOCAL enable_seqscan = off;")
+        for name, (sql, params) in statements.items():
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cur.fetchone()[0][0]["Plan"]
+            results[name] = seq_scanned_tables(plan)
+            if results[name]:
+                logger.warning(f"Hot query '{name}' has no usable index: seq scan on {results[name]}")
+            else:
+                logger.info(f"Hot query '{name}' uses an index.")
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+    return results
 
-    # Drop all existing tables
-    logger.info("Dropping existing tables...")
-    for command in drop_commands:
+
+def drop_tables(cur):
+    """
+    Drop every schema table and the version history, for an explicit rebuild.
+    """
+    logger.info("Rebuild requested: dropping all tables...")
+    for table in TABLES + ["schema_version"]:
         try:
-            cur.execute(command)
+            cur.execute(f"DROP TABLE IF EXISTS {table} CASCADE;")
         except Exception as e:
-            logger.error(f"Failed to execute DROP command: {e}")
+            logger.error(f"Failed to drop table {table}: {e}")
             raise
 
-    # Recreate tables fresh
-    logger.info("Creating tables...")
-    for command in create_commands:
+
+def current_version(cur):
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version;")
+    return cur.fetchone()[0]
+
+
+def migrate(conn, cur):
+    """
+    Apply every migration newer than the recorded schema version, each in its
+    own transaction together with its schema_version row.
+    Returns the list of versions applied.
+    """
+    cur.execute(SCHEMA_VERSION_TABLE)
+    conn.commit()
+
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        # Re-read under the lock in case another run migrated meanwhile
+        cur.execute("SELECT pg_advisory_xact_lock(%s);", (MIGRATION_LOCK_ID,))
+        if version <= current_version(cur):
+            conn.commit()
+            continue
+
+        logger.info(f"Applying migration {version}: {description}")
         try:
-            cur.execute(command)
+            for statement in statements:
+                cur.execute(statement)
+            cur.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s);",
+                (version, description)
+            )
+            conn.commit()
         except Exception as e:
-            logger.error(f"Failed to execute CREATE TABLE command: {e}")
+            conn.rollback()
+            logger.error(f"Migration {version} ({description}) failed: {e}")
             raise
+        applied.append(version)
+
+    return applied
+
+
+def create_tables(rebuild=False):
+    """
+    Bring the schema up to LATEST_VERSION without touching existing data.
+    @param rebuild: drop every table first and migrate from scratch (full reload)
+    Returns the list of migration versions applied by this call.
+    """
+    logger.info(f"Starting schema migration (rebuild={rebuild})...")
 
     try:
-        conn.commit()
-        logger.info("All table changes committed to database.")
-    except Exception as e:
-        logger.error(f"Commit failed: {e}")
+        conn = connect()
+        cur = conn.cursor()
+    except Exception:
+        logger.error("Could not initialize cursor/connection for table creation.")
         raise
 
+    if rebuild:
+        drop_tables(cur)
+        conn.commit()
+
+    applied = migrate(conn, cur)
+
     cur.close()
     conn.close()
 
-    logger.info("All tables dropped and recreated successfully.")
-    print("All tables dropped and recreated successfully")
+    if applied:
+        logger.info(f"Applied migrations {applied}; schema is at version {LATEST_VERSION}.")
+        print(f"Applied migrations {applied}; schema is at version {LATEST_VERSION}")
+    else:
+        logger.info(f"Schema already at version {LATEST_VERSION}; nothing to migrate.")
+        print(f"Schema already at version {LATEST_VERSION}")
+
+    return applied
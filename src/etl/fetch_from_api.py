@@ -1,69 +1,313 @@
 import json
 import os
-import requests
-from .logger import get_logger 
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from .crawl_checkpoint import CrawlCheckpoint
+from .loc_client import LocClient
+from .projection import RESPONSE_ATTRIBUTES, project_records
+from .rate_limiter import TokenBucket
+from .response_cache import ResponseCache
+from .watermark import incremental_params, load_watermark
+from .raw_io import open_raw, raw_filename, write_ndjson_records
+from .logger import get_logger
 
 raw_data_saved_dir = "data/raw"
+LOC_BASE_URL = "https://www.loc.gov"
 
 logger = get_logger("fetch_from_api")
 
 
-def fetch_from_api(collection="newspapers", max_pages=2, delay=1):
+def page_url(collection, page=1, params=None):
     """
-    Fetch results from LOC API and merge into one JSON file.
-    @param max_pages: how many pages to fetch
-    @param delay: delay between requests
+    Build the URL for one page of a collection.
+    LOC pages results with the `sp` (start page) query parameter.
+    @param params: extra query parameters, e.g. a date filter
     """
+    url = f"{LOC_BASE_URL}/{collection}/?fo=json"
+    if params:
+        url += "&" + urlencode(params)
+    if page > 1:
+        url += f"&sp={page}"
+    return url
 
-    logger.info(f"Starting API fetch for collection='{collection}', max_pages={max_pages}")
 
-    base_url = f"https://www.loc.gov/{collection}/?fo=json"
-    url = base_url
-    all_results = []
+def fetch_page(client, url, page, projection=None):
+    """
+    Request a single result page and return the decoded JSON body.
+    With a projection, unused result keys are dropped before anything is stored.
+    """
+    print(f"Fetching page {page}: {url}")
+    logger.info(f"Fetching page {page}: {url}")
+
+    try:
+        resp = client.get(url)
+    except Exception as e:
+        logger.error(f"Network error while requesting page {page}: {e}")
+        raise
 
-    for page in range(1, max_pages + 1):
+    if resp.status_code != 200:
+        logger.error(f"Request failed with status {resp.status_code} for URL {url}")
+        raise Exception(f"Request failed:{resp.status_code}")
 
-        print(f"Fetching page {page}: {url}")
-        logger.info(f"Fetching page {page}: {url}")
+    data = resp.json()
+    if projection is not None:
+        data["results"] = project_records(data.get("results", []), projection)
+    logger.info(f"Retrieved {len(data.get('results', []))} results on page {page}")
 
-        try:
-            resp = requests.get(url)
-        except Exception as e:
-            logger.error(f"Network error while requesting page {page}: {e}")
-            raise
+    return data
 
-        if resp.status_code != 200:
-            logger.error(f"Request failed with status {resp.status_code} for URL {url}")
-            raise Exception(f"Request failed:{resp.status_code}")
 
-        data = resp.json()
+def fetch_serial(client, url, max_pages, first_page=1, checkpoint=None, projection=None):
+    """
+    Walk result pages one at a time by following `pagination.next`.
+    Yields each page's result list as it arrives.
+    """
+    for page in range(first_page, max_pages + 1):
+        data = fetch_page(client, url, page, projection)
         results = data.get("results", [])
 
-        logger.info(f"Retrieved {len(results)} results on page {page}")
-        all_results.extend(results)
-
         pagination = data.get("pagination", {})
         url = pagination.get("next")
 
+        if checkpoint is not None:
+            checkpoint.save_page(page, results, next_url=url, total_pages=pagination.get("total"))
+
+        yield results
+
         if not url:
             print("No more pages.")
             logger.info("No more pages returned by API.")
             break
 
 
+def fetch_concurrent(client, collection, max_pages, concurrency, checkpoint=None, params=None,
+                     projection=None):
+    """
+    Fetch page 1 to learn the page count, then request the remaining
+    pages in parallel with at most `concurrency` requests in flight.
+    Yields each page's result list in page order.
+    """
+    def fetch_one(page):
+        data = fetch_page(client, page_url(collection, page, params), page, projection)
+        results = data.get("results", [])
+        pagination = data.get("pagination", {})
+        if checkpoint is not None:
+            # Saved by the worker so finished pages survive a failure elsewhere
+            checkpoint.save_page(page, results, next_url=pagination.get("next"),
+                                 total_pages=pagination.get("total"))
+        return results, pagination
+
+    if checkpoint is not None and checkpoint.has_page(1):
+        if checkpoint.total_pages is None:
+            # An earlier run never learned the page count, so resume by cursor
+            yield from fetch_resumed_serial(client, collection, max_pages, checkpoint, params, projection)
+            return
+        yield checkpoint.load_page(1)
+        total_pages = checkpoint.total_pages
+    else:
+        results, pagination = fetch_one(1)
+        yield results
+
+        total_pages = pagination.get("total")
+
+        if total_pages is None:
+            # Without a page count we can't compute URLs up front
+            logger.warning("API did not report a page count; falling back to serial fetch.")
+            next_url = pagination.get("next")
+            if next_url and max_pages > 1:
+                yield from fetch_serial(client, next_url, max_pages, first_page=2, checkpoint=checkpoint,
+                                      projection=projection)
+            return
 
-    # Save combined JSON
-    output_path = os.path.join(raw_data_saved_dir, f"{collection}_raw.json")
+    last_page = min(max_pages, int(total_pages))
+    done = checkpoint.completed_pages() if checkpoint is not None else set()
+
+    if last_page > 1:
+        logger.info(f"Fetching pages 2-{last_page} with concurrency={concurrency}")
+        upcoming = (page for page in range(2, last_page + 1) if page not in done)
+        in_flight = {}
+
+        def submit_next():
+            page = next(upcoming, None)
+            if page is not None:
+                in_flight[page] = pool.submit(fetch_one, page)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                # A sliding window of `concurrency` pages: a failure stops the crawl
+                # promptly and at most that many results wait out of order
+                for _ in range(concurrency):
+                    submit_next()
+                # Walk pages in order so output stays in page order
+                for page in range(2, last_page + 1):
+                    if page in done:
+                        yield checkpoint.load_page(page)
+                        continue
+                    results = in_flight.pop(page).result()[0]
+                    submit_next()
+                    yield results
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    if last_page >= int(total_pages):
+        print("No more pages.")
+        logger.info("No more pages returned by API.")
+
+
+def fetch_resumed_serial(client, collection, max_pages, checkpoint, params=None, projection=None):
+    """
+    Serve the pages already on disk, then continue following `pagination.next`
+    from the cursor saved with the last completed page.
+    """
+    done = checkpoint.completed_through()
+
+    for page in range(1, min(done, max_pages) + 1):
+        yield checkpoint.load_page(page)
+
+    if done == 0:
+        url = page_url(collection, 1, params)
+    else:
+        url = checkpoint.next_url(done)
+        if not url or done >= max_pages:
+            return
+        print(f"Resuming crawl at page {done + 1}")
+        logger.info(f"Resuming crawl at page {done + 1}: {url}")
+
+    yield from fetch_serial(client, url, max_pages, first_page=done + 1, checkpoint=checkpoint,
+                            projection=projection)
+
+
+def fetch_pages(client, collection, max_pages, concurrency, checkpoint=None, use_cache=False, delay=0,
+                params=None, projection=None, rate=None):
+    """
+    Yield per-page result lists in page order using the serial or concurrent path.
+    """
+    if max_pages <= 0:
+        return
+
+    owns_client = client is None
+    if owns_client:
+        cache = ResponseCache(os.path.join(raw_data_saved_dir, ".cache")) if use_cache else None
+        # One bucket shared by all workers caps the whole crawl, not each worker
+        rate = rate or (1 / delay if delay > 0 else None)
+        rate_limiter = TokenBucket(rate=rate) if rate else None
+        client = LocClient(pool_size=max(concurrency, 1), cache=cache, rate_limiter=rate_limiter)
 
     try:
-        with open(output_path, "w") as f:
-            json.dump(all_results, f, indent=4)
-    except Exception as e:
-        logger.error(f"Failed to write JSON output: {e}")
-        raise
+        if concurrency > 1:
+            yield from fetch_concurrent(client, collection, max_pages, concurrency, checkpoint, params,
+                                        projection)
+        elif checkpoint is not None:
+            yield from fetch_resumed_serial(client, collection, max_pages, checkpoint, params, projection)
+        else:
+            yield from fetch_serial(client, page_url(collection, 1, params), max_pages, projection=projection)
+    finally:
+        cache = getattr(client, "cache", None)
+        if cache is not None:
+            print(f"Response cache: {cache.summary()}")
+            logger.info(f"Response cache: {cache.summary()}")
+        if owns_client:
+            client.close()
+
+
+def fetch_from_api(collection="newspapers", max_pages=2, delay=1, concurrency=1, client=None,
+                   output_format="json", compression=None, checkpoint=False, use_cache=False,
+                   incremental=False, since=None, params=None, output_name=None, output_dir=None,
+                   projection=None, rate=None):
+    """
+    Fetch results from LOC API and merge into one JSON file.
+    @param max_pages: how many pages to fetch
+    @param delay: minimum average seconds between requests, enforced by a shared
+                  token bucket that slows down further on 429 / Retry-After.
+                  The bucket is shared by all `concurrency` workers, so the
+                  default delay=1 caps a concurrent crawl at 1 req/s in total
+    @param rate: total requests per second across all workers; overrides `delay`
+    @param concurrency: max requests in flight; 1 follows `pagination.next` serially
+    @param client: shared LocClient; one sized for `concurrency` is created if omitted.
+                   A passed-in client keeps its own cache and rate limiter, so
+                   `delay`, `rate` and `use_cache` only apply to the created one
+    @param output_format: "json" writes one array at the end, "ndjson" streams one record per line
+    @param compression: None, "gzip" or "zstd"
+    @param checkpoint: persist every page under data/raw/<collection>_pages/ and
+                       resume from it on rerun, never re-requesting finished pages.
+                       The directory is removed once the raw output is written
+    @param use_cache: revalidate pages against the on-disk cache in data/raw/.cache
+    @param incremental: only request records issued on/after the watermark
+                        (newest issues.date_issued, else the stored watermark file).
+                        The watermark is not advanced here; see advance_watermark
+    @param since: explicit YYYY-MM-DD watermark overriding the lookup
+    @param params: extra LOC query parameters (date range, facet filter, ...)
+    @param output_name: file name stem instead of `collection`, e.g. for one shard of a crawl
+    @param output_dir: directory for raw output instead of data/raw
+    @param projection: keys to keep from each result (see projection.CSV_PROJECTION);
+                       also asks the API for only `results` and `pagination`
+    """
+
+    logger.info(f"Starting API fetch for collection='{collection}', max_pages={max_pages}")
+
+    output_dir = output_dir or raw_data_saved_dir
+    name = output_name or collection
+    query = dict(params or {})
+    pages_dir = f"{name}_pages"
+    if projection is not None:
+        query["at"] = RESPONSE_ATTRIBUTES
+    if incremental:
+        since = since or load_watermark(name, output_dir)
+        if since:
+            # A date shard keeps its own range; only the part after `since` is requested
+            incremental_query = incremental_params(since, query.get("dates"))
+            pages_dir = f"{name}_{since}_pages"
+            if incremental_query is None:
+                max_pages = 0
+                print(f"Nothing in {query['dates']} is newer than {since}; skipping fetch")
+                logger.info(f"Nothing in {query['dates']} is newer than {since}; skipping fetch.")
+            else:
+                query.update(incremental_query)
+                print(f"Incremental fetch of records issued since {since}")
+                logger.info(f"Incremental fetch of records issued since {since}")
+        else:
+            logger.info("No watermark found; running a full fetch.")
+
+    output_path = os.path.join(output_dir, raw_filename(name, output_format, compression))
+    crawl_checkpoint = None
+    if checkpoint:
+        crawl_checkpoint = CrawlCheckpoint(os.path.join(output_dir, pages_dir))
+
+    pages = fetch_pages(client, collection, max_pages, concurrency, crawl_checkpoint, use_cache, delay,
+                        query or None, projection, rate)
+    total_records = 0
+
+    if output_format == "ndjson":
+        # Stream each page to disk as it arrives so memory stays flat
+        try:
+            with open_raw(output_path, "w") as f:
+                for results in pages:
+                    write_ndjson_records(f, results)
+                    total_records += len(results)
+        except OSError as e:
+            logger.error(f"Failed to write NDJSON output: {e}")
+            raise
+    else:
+        all_results = []
+        for results in pages:
+            all_results.extend(results)
+        total_records = len(all_results)
+
+        # Save combined JSON
+        try:
+            with open_raw(output_path, "w") as f:
+                json.dump(all_results, f, indent=4)
+        except Exception as e:
+            logger.error(f"Failed to write JSON output: {e}")
+            raise
+
+    print(f"Saved {total_records} total records to {output_path}")
+    logger.info(f"Saved {total_records} total records to {output_path}")
 
-    print(f"Saved {len(all_results)} total records to {output_path}")
-    logger.info(f"Saved {len(all_results)} total records to {output_path}")
+    if crawl_checkpoint is not None:
+        # The raw output now holds every page; a stale checkpoint would be replayed next run
+        crawl_checkpoint.clear()
 
     return output_path
 
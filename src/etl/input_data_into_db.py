@@ -1,6 +1,22 @@
 import psycopg2
-import pandas as pd
 from .logger import get_logger   # <-- added
+from .queries import (
+    DELETE_ISSUE_LANGUAGES_SQL,
+    DELETE_ISSUE_SUBJECTS_SQL,
+    INSERT_ISSUE_LANGUAGE_SQL,
+    INSERT_ISSUE_SUBJECT_SQL,
+    INSERT_LANGUAGE_SQL,
+    INSERT_LOCATION_SQL,
+    INSERT_SUBJECT_SQL,
+    ISSUE_ID_SQL,
+    LANGUAGE_ID_SQL,
+    LOCATION_ID_SQL,
+    NEWSPAPER_ID_SQL,
+    SUBJECT_ID_SQL,
+    UPSERT_ISSUE_SQL,
+    UPSERT_NEWSPAPER_SQL,
+)
+from .table_io import list_cell_values, read_table
 
 DB_NAME = "newspapers"
 DB_USER = "etl_user"
@@ -10,6 +26,14 @@ DB_PORT = "5432"
 
 CLEAN_CSV = "data/cleaned/newspapers_cleaned.csv"
 
+# Only these cleaned columns are loaded; Parquet input skips the rest on disk
+LOAD_COLUMNS = [
+    "id", "title", "item_date_issued", "item_medium", "image_url", "url",
+    "item_lccn", "item_newspaper_title",
+    "location_city", "location_state", "location_country",
+    "item_language", "subject",
+]
+
 # create logger
 logger = get_logger("load_into_db")
 
@@ -29,13 +53,37 @@ def connect():
         logger.error(f"Database connection failed: {e}")
         raise
 
-def input_into_db():
+def issue_value_pairs(df, column):
+    """
+    Pre-exploded (issue id, value) pairs for a multi-valued column.
+    Parquet input holds lists; CSV input holds JSON-array text.
+    """
+    pairs = df[["id"]].assign(value=df[column].map(list_cell_values)).explode("value").dropna()
+    pairs["value"] = pairs["value"].astype(str).str.strip()
+    return pairs.drop_duplicates()
+
+
+def lookup_issue_id(cur, issue_ids, issue_loc_id):
+    if issue_loc_id not in issue_ids:
+        cur.execute(ISSUE_ID_SQL, (issue_loc_id,))
+        issue_ids[issue_loc_id] = cur.fetchone()[0]
+    return issue_ids[issue_loc_id]
+
+
+def input_into_db(input_path=None):
+    """
+    Load the cleaned table (CSV or Parquet, defaults to CLEAN_CSV) into Postgres.
+    Rows are upserted by their natural keys, so loading into a populated
+    database updates changed issues and adds new ones without a rebuild.
+    """
     logger.info("Starting LOAD step from cleaned CSV → Postgres.")
     print("\n--- LOADING CLEANED DATA INTO POSTGRES ---")
 
+    input_path = input_path or CLEAN_CSV
+
     try:
-        df = pd.read_csv(CLEAN_CSV)
-        logger.info(f"Loaded cleaned CSV: {CLEAN_CSV} ({len(df)} rows)")
+        df = read_table(input_path, columns=LOAD_COLUMNS)
+        logger.info(f"Loaded cleaned CSV: {input_path} ({len(df)} rows)")
     except Exception as e:
         logger.error(f"Failed to read cleaned CSV file: {e}")
         raise
@@ -55,11 +103,7 @@ def input_into_db():
     for _, row in newspaper_rows.iterrows():
         try:
             cur.execute(
-                """
-                INSERT INTO newspapers (lccn, title)
-                VALUES (%s, %s)
-                ON CONFLICT (lccn) DO NOTHING;
-                """,
+                UPSERT_NEWSPAPER_SQL,
                 (row["item_lccn"], row["item_newspaper_title"])
             )
         except Exception as e:
@@ -76,11 +120,7 @@ def input_into_db():
     for _, row in location_rows.iterrows():
         try:
             cur.execute(
-                """
-                INSERT INTO locations (city, state, country)
-                VALUES (%s, %s, %s)
-                ON CONFLICT DO NOTHING;
-                """,
+                INSERT_LOCATION_SQL,
                 (row["location_city"], row["location_state"], row["location_country"])
             )
         except Exception as e:
@@ -91,13 +131,14 @@ def input_into_db():
     logger.info('"locations" table populated.')
     print('"locations" table populated')
 
-    # populate fact table (issues)
+    # populate fact table (issues); reloaded issues take the new values
     logger.info("Populating issues table...")
+    issue_ids = {}
     for _, row in df.iterrows():
 
         try:
             cur.execute(
-                "SELECT newspaper_id FROM newspapers WHERE lccn=%s",
+                NEWSPAPER_ID_SQL,
                 (row["item_lccn"],)
             )
             newspaper_id = cur.fetchone()[0]
@@ -107,10 +148,7 @@ def input_into_db():
 
         try:
             cur.execute(
-                """
-                SELECT location_id FROM locations
-                WHERE city=%s AND state=%s AND country=%s
-                """,
+                LOCATION_ID_SQL,
                 (row["location_city"], row["location_state"], row["location_country"])
             )
             location_id = cur.fetchone()[0]
@@ -120,20 +158,7 @@ def input_into_db():
 
         try:
             cur.execute(
-                """
-                INSERT INTO issues (
-                    issue_loc_id,
-                    date_issued,
-                    title,
-                    medium,
-                    image_url,
-                    url,
-                    newspaper_id,
-                    location_id
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (issue_loc_id) DO NOTHING;
-                """,
+                UPSERT_ISSUE_SQL,
                 (
                     row["id"],
                     row["item_date_issued"],
@@ -145,48 +170,47 @@ def input_into_db():
                     location_id
                 )
             )
+            issue_ids[row["id"]] = cur.fetchone()[0]
         except Exception as e:
             logger.error(f"Failed inserting issue row {row['id']}: {e}")
             raise
 
+    # Reloaded issues get their language / subject links rebuilt below
+    try:
+        cur.execute(DELETE_ISSUE_LANGUAGES_SQL, (list(issue_ids.values()),))
+        cur.execute(DELETE_ISSUE_SUBJECTS_SQL, (list(issue_ids.values()),))
+    except Exception as e:
+        logger.error(f"Failed clearing junction rows for reloaded issues: {e}")
+        raise
+
     conn.commit()
     logger.info('"issues" table populated.')
     print('"issues" table populated')
 
     # languages + junction
     logger.info("Populating languages + issue_languages tables...")
-    for _, row in df.iterrows():
-
-        cur.execute("SELECT issue_id FROM issues WHERE issue_loc_id=%s", (row["id"],))
-        issue_id = cur.fetchone()[0]
+    language_ids = {}
+    for issue_loc_id, lang in issue_value_pairs(df, "item_language").itertuples(index=False):
 
-        languages = [lang.strip() for lang in str(row["item_language"]).split(",")]
+        issue_id = lookup_issue_id(cur, issue_ids, issue_loc_id)
 
-        for lang in languages:
-            try:
+        try:
+            if lang not in language_ids:
                 cur.execute(
-                    """
-                    INSERT INTO languages (name)
-                    VALUES (%s)
-                    ON CONFLICT (name) DO NOTHING;
-                    """,
+                    INSERT_LANGUAGE_SQL,
                     (lang,)
                 )
 
-                cur.execute("SELECT language_id FROM languages WHERE name=%s", (lang,))
-                language_id = cur.fetchone()[0]
+                cur.execute(LANGUAGE_ID_SQL, (lang,))
+                language_ids[lang] = cur.fetchone()[0]
 
-                cur.execute(
-                    """
-                    INSERT INTO issue_languages (issue_id, language_id)
-                    VALUES (%s, %s)
-                    ON CONFLICT DO NOTHING;
-                    """,
-                    (issue_id, language_id)
-                )
-            except Exception as e:
-                logger.error(f"Failed inserting language '{lang}' for issue {issue_id}: {e}")
-                raise
+            cur.execute(
+                INSERT_ISSUE_LANGUAGE_SQL,
+                (issue_id, language_ids[lang])
+            )
+        except Exception as e:
+            logger.error(f"Failed inserting language '{lang}' for issue {issue_id}: {e}")
+            raise
 
     conn.commit()
     logger.info('"language" table populated.')
@@ -194,38 +218,28 @@ def input_into_db():
 
     # subjects + junction
     logger.info("Populating subjects + issue_subjects tables...")
-    for _, row in df.iterrows():
-
-        cur.execute("SELECT issue_id FROM issues WHERE issue_loc_id=%s", (row["id"],))
-        issue_id = cur.fetchone()[0]
+    subject_ids = {}
+    for issue_loc_id, sub in issue_value_pairs(df, "subject").itertuples(index=False):
 
-        subjects = [sub.strip() for sub in str(row["subject"]).split(",")]
+        issue_id = lookup_issue_id(cur, issue_ids, issue_loc_id)
 
-        for sub in subjects:
-            try:
+        try:
+            if sub not in subject_ids:
                 cur.execute(
-                    """
-                    INSERT INTO subjects (name)
-                    VALUES (%s)
-                    ON CONFLICT (name) DO NOTHING;
-                    """,
+                    INSERT_SUBJECT_SQL,
                     (sub,)
                 )
 
-                cur.execute("SELECT subject_id FROM subjects WHERE name=%s", (sub,))
-                subject_id = cur.fetchone()[0]
+                cur.execute(SUBJECT_ID_SQL, (sub,))
+                subject_ids[sub] = cur.fetchone()[0]
 
-                cur.execute(
-                    """
-                    INSERT INTO issue_subjects (issue_id, subject_id)
-                    VALUES (%s, %s)
-                    ON CONFLICT DO NOTHING;
-                    """,
-                    (issue_id, subject_id)
-                )
-            except Exception as e:
-                logger.error(f"Failed inserting subject '{sub}' for issue {issue_id}: {e}")
-                raise
+            cur.execute(
+                INSERT_ISSUE_SUBJECT_SQL,
+                (issue_id, subject_ids[sub])
+            )
+        except Exception as e:
+            logger.error(f"Failed inserting subject '{sub}' for issue {issue_id}: {e}")
+            raise
 
     conn.commit()
     cur.close()
@@ -0,0 +1,151 @@
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from .logger import get_logger
+
+# Statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+logger = get_logger("loc_client")
+
+
+def retry_after_seconds(resp):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+    Returns None when the header is missing or unparseable.
+    """
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class LocClient:
+    """
+    Shared HTTP client for the LOC API.
+    Every fetcher should go through one of these so requests reuse a pooled
+    keep-alive session, negotiate compressed transfer, time out instead of
+    hanging, and retry 429/5xx responses with exponential backoff.
+    """
+
+    def __init__(self, pool_size=10, timeout=(5, 30), max_retries=3, backoff=1.0, cache=None,
+                 rate_limiter=None):
+        """
+        @param pool_size: keep-alive connections kept per host (match your concurrency)
+        @param timeout: (connect, read) timeout in seconds
+        @param max_retries: retries after the first attempt
+        @param backoff: base delay in seconds, doubled on every retry
+        @param cache: optional ResponseCache used for conditional requests
+        @param rate_limiter: optional TokenBucket shared by every request on the network
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+    def backoff_delay(self, attempt):
+        return self.backoff * (2 ** attempt)
+
+    def send(self, url, headers=None):
+        """
+        GET a URL, retrying connection errors, timeouts and RETRY_STATUSES.
+        Returns the final response; callers decide what a non-200 means.
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Giving up on {url} after {attempt + 1} attempts: {e}")
+                    raise
+                wait = self.backoff_delay(attempt)
+                logger.warning(f"Network error on {url} ({e}); retrying in {wait:.1f}s")
+                time.sleep(wait)
+                continue
+
+            if resp.status_code in RETRY_STATUSES:
+                wait = retry_after_seconds(resp)
+                if wait is None:
+                    wait = self.backoff_delay(attempt)
+
+                if resp.status_code == 429 and self.rate_limiter is not None:
+                    # The limiter pauses every caller, so don't sleep here as well
+                    self.rate_limiter.throttled(wait)
+                    wait = 0
+
+                if attempt < self.max_retries:
+                    logger.warning(f"Status {resp.status_code} on {url}; retrying in {wait:.1f}s")
+                    time.sleep(wait)
+                    continue
+            elif self.rate_limiter is not None:
+                self.rate_limiter.succeeded()
+
+            return resp
+
+    def get(self, url):
+        """
+        GET a URL through the response cache when one is configured.
+        Fresh entries are served without a request; stale ones are
+        revalidated with If-None-Match / If-Modified-Since.
+        """
+        if self.cache is None:
+            return self.send(url)
+
+        entry = self.cache.lookup(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record("hits")
+            return self.cache.response_for(entry)
+
+        resp = self.send(url, headers=self.cache.conditional_headers(entry))
+
+        if resp.status_code == 304 and entry is not None:
+            self.cache.record("revalidated")
+            self.cache.refresh(url, entry)
+            return self.cache.response_for(entry)
+
+        if resp.status_code == 200:
+            self.cache.record("misses")
+            self.cache.store(url, resp)
+
+        return resp
+
+    def get_json(self, url):
+        resp = self.get(url)
+        if resp.status_code != 200:
+            logger.error(f"Request failed with status {resp.status_code} for URL {url}")
+            raise Exception(f"Request failed:{resp.status_code}")
+        return resp.json()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
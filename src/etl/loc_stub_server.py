@@ -0,0 +1,201 @@
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from .logger import get_logger
+from .raw_io import iter_raw_records
+
+SEED_FILE = "data/raw/newspapers_raw.json"
+
+logger = get_logger("loc_stub_server")
+
+
+def load_seed_records(seed_path=SEED_FILE, repeat=1):
+    """
+    Load LOC records from a raw file, optionally repeated `repeat` times with
+    unique ids so benchmarks can page through more data than the seed holds.
+    """
+    seed = list(iter_raw_records(seed_path))
+    if repeat <= 1:
+        return seed
+
+    records = []
+    for copy in range(repeat):
+        for record in seed:
+            record = dict(record)
+            record["id"] = f"{record.get('id', '')}#copy-{copy}"
+            records.append(record)
+    return records
+
+
+class LocStubServer:
+    """
+    Local stand-in for the LOC JSON API.
+
+    Serves /<collection>/?fo=json&sp=<page> with LOC-shaped `results` and
+    `pagination` blocks, honours `c` (results per page) and `at` (response
+    attributes), sends ETags and answers If-None-Match with 304, and gzips
+    when asked. Latency, 5xx errors and 429 throttling can be injected to
+    exercise the fetch layer.
+
+        with LocStubServer(records, latency=0.02) as server:
+            fetch_module.LOC_BASE_URL = server.base_url
+    """
+
+    def __init__(self, records=None, perpage=25, latency=0.0, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=0, seed=0, host="127.0.0.1", port=0):
+        """
+        @param records: records to serve; defaults to the committed raw sample
+        @param latency: seconds to sleep before answering each request
+        @param error_rate: fraction of requests answered with 503
+        @param throttle_rate: fraction of requests answered with 429 + Retry-After
+        @param seed: random seed so injected failures are reproducible
+        """
+        self.records = records if records is not None else load_seed_records()
+        self.perpage = perpage
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "throttled": 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), self.handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def roll(self):
+        """
+        Decide whether this request fails: returns "error", "throttled" or None.
+        """
+        with self.lock:
+            value = self.random.random()
+        if value < self.error_rate:
+            return "error"
+        if value < self.error_rate + self.throttle_rate:
+            return "throttled"
+        return None
+
+    def page_body(self, path, query):
+        perpage = int(query.get("c", [self.perpage])[0])
+        page = int(query.get("sp", ["1"])[0])
+        total_pages = max(1, -(-len(self.records) // perpage))
+
+        start = (page - 1) * perpage
+        results = self.records[start:start + perpage]
+
+        def link(target):
+            if target < 1 or target > total_pages:
+                return None
+            params = {key: values[0] for key, values in query.items()}
+            params["sp"] = target
+            return f"{self.base_url}{path}?{urlencode(params)}"
+
+        body = {
+            "results": results,
+            "pagination": {
+                "current": page,
+                "next": link(page + 1),
+                "previous": link(page - 1),
+                "total": total_pages,
+                "of": len(self.records),
+                "perpage": perpage,
+                "from": start + 1,
+                "to": start + len(results),
+            },
+            # LOC pages also carry facets and search metadata that `at=` can drop
+            "facets": [],
+            "search": {"query": "", "type": "search"},
+        }
+
+        if "at" in query:
+            keep = query["at"][0].split(",")
+            body = {key: value for key, value in body.items() if key in keep}
+
+        return body
+
+    def handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_body(self, status, body, headers):
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                server.count("requests")
+                if server.latency:
+                    time.sleep(server.latency)
+
+                failure = server.roll()
+                if failure == "error":
+                    server.count("errors")
+                    self.send_body(503, b"", {})
+                    return
+                if failure == "throttled":
+                    server.count("throttled")
+                    self.send_body(429, b"", {"Retry-After": str(server.retry_after)})
+                    return
+
+                parts = urlsplit(self.path)
+                payload = server.page_body(parts.path, parse_qs(parts.query))
+                body = json.dumps(payload).encode("utf-8")
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+                if self.headers.get("If-None-Match") == etag:
+                    server.count("not_modified")
+                    self.send_body(304, b"", {"ETag": etag})
+                    return
+
+                headers = {"Content-Type": "application/json", "ETag": etag}
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    headers["Content-Encoding"] = "gzip"
+
+                server.count("ok")
+                self.send_body(200, body, headers)
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"LOC stub server listening on {self.base_url} ({len(self.records)} records)")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
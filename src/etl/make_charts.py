@@ -3,6 +3,7 @@ import pandas as pd
 from pathlib import Path
 import matplotlib.pyplot as plt
 from .logger import get_logger   # <-- added
+from .queries import ISSUES_PER_STATE_SQL, ISSUES_PER_YEAR_SQL, LANGUAGE_FREQUENCY_SQL, PAGES_PER_ISSUE_SQL
 
 DB_NAME = "newspapers"
 DB_USER = "etl_user"
@@ -46,16 +47,7 @@ def query_to_df(sql):
 def issues_per_year():
     logger.info("Generating chart: issues_per_year")
 
-    sql = """
-    SELECT
-        EXTRACT(YEAR FROM date_issued)::INT AS year,
-        COUNT(*) AS issue_count
-    FROM issues
-    GROUP BY year
-    ORDER BY year;
-    """
-
-    df = query_to_df(sql)
+    df = query_to_df(ISSUES_PER_YEAR_SQL)
 
     if df.empty:
         logger.warning("No data returned for issues_per_year.")
@@ -81,17 +73,7 @@ def issues_per_year():
 def issues_per_state():
     logger.info("Generating chart: issues_per_state")
 
-    sql = """
-        SELECT
-            l.state,
-            COUNT(i.issue_id) AS issue_count
-        FROM issues i
-        JOIN locations l ON i.location_id = l.location_id
-        GROUP BY l.state
-        ORDER BY issue_count DESC;
-    """
-
-    df = query_to_df(sql)
+    df = query_to_df(ISSUES_PER_STATE_SQL)
 
     if df.empty:
         logger.warning("No data for issues_per_state")
@@ -116,17 +98,7 @@ def issues_per_state():
 def language_frequency():
     logger.info("Generating chart: language_frequency")
 
-    sql = """
-        SELECT
-            l.name AS language,
-            COUNT(il.issue_id) AS issue_count
-        FROM languages l
-        JOIN issue_languages il ON l.language_id = il.language_id
-        GROUP BY l.name
-        ORDER BY issue_count DESC;
-    """
-
-    df = query_to_df(sql)
+    df = query_to_df(LANGUAGE_FREQUENCY_SQL)
 
     if df.empty:
         logger.warning("No data for language frequency")
@@ -151,15 +123,7 @@ def language_frequency():
 def pages_per_issue():
     logger.info("Generating chart: pages_per_issue")
 
-    sql = """
-        SELECT
-            REGEXP_REPLACE(medium, '[^0-9]', '', 'g')::INT AS page_count
-        FROM issues
-        WHERE medium IS NOT NULL
-          AND REGEXP_REPLACE(medium, '[^0-9]', '', 'g') ~ '^[0-9]+$';
-    """
-
-    df = query_to_df(sql)
+    df = query_to_df(PAGES_PER_ISSUE_SQL)
 
     if df.empty:
         logger.warning("No page-count data found.")
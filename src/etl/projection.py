@@ -0,0 +1,55 @@
+# Projection specs map a top-level result key to True (keep the value as-is)
+# or to a list of sub-keys to keep from a nested object.
+
+# Everything json_to_csv reads from a LOC result
+CSV_PROJECTION = {
+    "id": True,
+    "title": True,
+    "date": True,
+    "description": True,
+    "digitized": True,
+    "language": True,
+    "subject": True,
+    "location_city": True,
+    "location_state": True,
+    "location_country": True,
+    "image_url": True,
+    "url": True,
+    "item": [
+        "date_issued",
+        "created_published",
+        "medium",
+        "language",
+        "newspaper_title",
+        "library_of_congress_control_number",
+        "place_of_publication",
+    ],
+}
+
+# LOC `at=` parameter: only return these top-level response attributes
+# (drops facets, search options, etc. from every page)
+RESPONSE_ATTRIBUTES = "results,pagination"
+
+
+def project_record(record, projection):
+    """
+    Keep only the keys named in `projection`.
+    """
+    out = {}
+    for key, keep in projection.items():
+        if key not in record:
+            continue
+
+        value = record[key]
+        if keep is True or not isinstance(value, dict):
+            out[key] = value
+        else:
+            out[key] = {sub_key: value[sub_key] for sub_key in keep if sub_key in value}
+
+    return out
+
+
+def project_records(records, projection):
+    if projection is None:
+        return records
+    return [project_record(record, projection) for record in records]
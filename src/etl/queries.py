@@ -0,0 +1,119 @@
+# SQL run by the loader (input_data_into_db.py) and the charts (make_charts.py).
+# Kept in one place so create_tables.check_hot_query_indexes() EXPLAINs the
+# exact statements the pipeline executes.
+
+# --- loader ---
+
+UPSERT_NEWSPAPER_SQL = """
+    INSERT INTO newspapers (lccn, title)
+    VALUES (%s, %s)
+    ON CONFLICT (lccn) DO UPDATE SET title = EXCLUDED.title;
+"""
+
+INSERT_LOCATION_SQL = """
+    INSERT INTO locations (city, state, country)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (city, state, country) DO NOTHING;
+"""
+
+NEWSPAPER_ID_SQL = "SELECT newspaper_id FROM newspapers WHERE lccn=%s"
+
+LOCATION_ID_SQL = """
+    SELECT location_id FROM locations
+    WHERE city=%s AND state=%s AND country=%s
+"""
+
+UPSERT_ISSUE_SQL = """
+    INSERT INTO issues (
+        issue_loc_id,
+        date_issued,
+        title,
+        medium,
+        image_url,
+        url,
+        newspaper_id,
+        location_id
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (issue_loc_id) DO UPDATE SET
+        date_issued = EXCLUDED.date_issued,
+        title = EXCLUDED.title,
+        medium = EXCLUDED.medium,
+        image_url = EXCLUDED.image_url,
+        url = EXCLUDED.url,
+        newspaper_id = EXCLUDED.newspaper_id,
+        location_id = EXCLUDED.location_id
+    RETURNING issue_id;
+"""
+
+ISSUE_ID_SQL = "SELECT issue_id FROM issues WHERE issue_loc_id=%s"
+
+DELETE_ISSUE_LANGUAGES_SQL = "DELETE FROM issue_languages WHERE issue_id = ANY(%s);"
+DELETE_ISSUE_SUBJECTS_SQL = "DELETE FROM issue_subjects WHERE issue_id = ANY(%s);"
+
+INSERT_LANGUAGE_SQL = """
+    INSERT INTO languages (name)
+    VALUES (%s)
+    ON CONFLICT (name) DO NOTHING;
+"""
+
+LANGUAGE_ID_SQL = "SELECT language_id FROM languages WHERE name=%s"
+
+INSERT_ISSUE_LANGUAGE_SQL = """
+    INSERT INTO issue_languages (issue_id, language_id)
+    VALUES (%s, %s)
+    ON CONFLICT DO NOTHING;
+"""
+
+INSERT_SUBJECT_SQL = """
+    INSERT INTO subjects (name)
+    VALUES (%s)
+    ON CONFLICT (name) DO NOTHING;
+"""
+
+SUBJECT_ID_SQL = "SELECT subject_id FROM subjects WHERE name=%s"
+
+INSERT_ISSUE_SUBJECT_SQL = """
+    INSERT INTO issue_subjects (issue_id, subject_id)
+    VALUES (%s, %s)
+    ON CONFLICT DO NOTHING;
+"""
+
+# --- charts ---
+
+ISSUES_PER_YEAR_SQL = """
+    SELECT
+        EXTRACT(YEAR FROM date_issued)::INT AS year,
+        COUNT(*) AS issue_count
+    FROM issues
+    GROUP BY year
+    ORDER BY year;
+"""
+
+ISSUES_PER_STATE_SQL = """
+    SELECT
+        l.state,
+        COUNT(i.issue_id) AS issue_count
+    FROM issues i
+    JOIN locations l ON i.location_id = l.location_id
+    GROUP BY l.state
+    ORDER BY issue_count DESC;
+"""
+
+LANGUAGE_FREQUENCY_SQL = """
+    SELECT
+        l.name AS language,
+        COUNT(il.issue_id) AS issue_count
+    FROM languages l
+    JOIN issue_languages il ON l.language_id = il.language_id
+    GROUP BY l.name
+    ORDER BY issue_count DESC;
+"""
+
+PAGES_PER_ISSUE_SQL = """
+    SELECT
+        REGEXP_REPLACE(medium, '[^0-9]', '', 'g')::INT AS page_count
+    FROM issues
+    WHERE medium IS NOT NULL
+      AND REGEXP_REPLACE(medium, '[^0-9]', '', 'g') ~ '^[0-9]+$';
+"""
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from .logger import get_logger
+
+logger = get_logger("rate_limiter")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every request in a crawl.
+
+    Tokens refill at `rate` per second up to `capacity`; each request takes
+    one. A 429 halves the rate and, if the server sent Retry-After, pauses
+    all callers until it expires. Successful responses then creep the rate
+    back up to the configured maximum.
+    """
+
+    def __init__(self, rate, capacity=1, min_rate=None, recovery=0.05):
+        """
+        @param rate: maximum requests per second
+        @param capacity: burst size; 1 never exceeds `rate` over any window
+        @param min_rate: floor the rate never drops below after throttling
+        @param recovery: fraction of the max rate regained per successful request
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = float(min_rate) if min_rate else self.max_rate / 16
+        self.capacity = float(capacity)
+        self.recovery = recovery
+
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Block until a request may be sent.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.refill(now)
+
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def throttled(self, retry_after=None):
+        """
+        Back off after a 429: halve the rate and honour Retry-After for everyone.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+        logger.warning(f"Throttled by API; rate lowered to {self.rate:.2f} req/s")
+
+    def succeeded(self):
+        """
+        Recover gradually toward the maximum rate.
+        """
+        with self.lock:
+            if self.rate < self.max_rate:
+                now = time.monotonic()
+                self.refill(now)
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
@@ -0,0 +1,175 @@
+import gzip
+import json
+import os
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .zst raw files
+    zstandard = None
+
+RAW_FORMATS = {"json": ".json", "ndjson": ".ndjson"}
+COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def raw_filename(name, output_format="json", compression=None):
+    """
+    Build the raw file name for a collection, e.g. newspapers_raw.ndjson.gz.
+    """
+    if output_format not in RAW_FORMATS:
+        raise ValueError(f"Unknown raw format '{output_format}'. Expected one of {list(RAW_FORMATS)}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'. Expected one of {list(COMPRESSIONS)}")
+
+    return f"{name}_raw{RAW_FORMATS[output_format]}{COMPRESSIONS[compression]}"
+
+
+def split_raw_path(path):
+    """
+    Return (stem, format, compression) for a raw file path.
+    newspapers_raw.ndjson.gz -> ("newspapers", "ndjson", "gzip")
+    """
+    name = os.path.basename(str(path))
+
+    compression = None
+    for codec, suffix in COMPRESSIONS.items():
+        if suffix and name.endswith(suffix):
+            compression = codec
+            name = name[: -len(suffix)]
+            break
+
+    output_format = "json"
+    for fmt, suffix in RAW_FORMATS.items():
+        if name.endswith(suffix):
+            output_format = fmt
+            name = name[: -len(suffix)]
+            break
+
+    if name.endswith("_raw"):
+        name = name[: -len("_raw")]
+
+    return name, output_format, compression
+
+
+def is_raw_file(name):
+    """
+    True for raw outputs: *_raw.json and *.ndjson files, optionally compressed.
+    Skips checkpoint state, manifests and watermarks that share data/raw.
+    """
+    base = os.path.basename(str(name))
+    for suffix in COMPRESSIONS.values():
+        if suffix and base.endswith(suffix):
+            base = base[: -len(suffix)]
+    return base.endswith(RAW_FORMATS["ndjson"]) or base.endswith("_raw" + RAW_FORMATS["json"])
+
+
+def open_raw(path, mode="r"):
+    """
+    Open a raw file in text mode, transparently (de)compressing by suffix.
+    """
+    path = str(path)
+    text_mode = mode if "t" in mode else mode + "t"
+
+    if path.endswith(COMPRESSIONS["gzip"]):
+        return gzip.open(path, text_mode, encoding="utf-8")
+
+    if path.endswith(COMPRESSIONS["zstd"]):
+        if zstandard is None:
+            raise ImportError("Reading or writing .zst raw files requires the 'zstandard' package")
+        return zstandard.open(path, text_mode, encoding="utf-8")
+
+    return open(path, mode, encoding="utf-8")
+
+
+def write_ndjson_records(f, records):
+    """
+    Append records to an open NDJSON file as compact one-line JSON.
+    """
+    for record in records:
+        f.write(json.dumps(record, separators=(",", ":")))
+        f.write("\n")
+
+
+JSON_WHITESPACE = " \t\n\r"
+ELEMENT_TERMINATORS = JSON_WHITESPACE + ",]"
+
+
+def iter_json_array(f, chunk_size=1 << 16):
+    """
+    Incrementally parse a top-level JSON array from a text file, yielding one
+    element at a time. Only the current chunk and element are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    pos = 0
+
+    def skip_whitespace():
+        # Returns False at end of input; refills the buffer as needed
+        nonlocal buf, pos
+        while True:
+            while pos < len(buf) and buf[pos] in JSON_WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return True
+            more = f.read(chunk_size)
+            if not more:
+                return False
+            buf, pos = more, 0
+
+    if not skip_whitespace() or buf[pos] != "[":
+        raise ValueError("Input JSON should be a list of objects")
+    pos += 1
+
+    if skip_whitespace() and buf[pos] == "]":
+        return
+
+    while True:
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of input inside JSON array")
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                value, end = None, None
+
+            # Retry with more data unless the element is followed by a separator
+            # already in the buffer: a number split across chunks ("1." + "5")
+            # can decode early as a shorter value
+            if end is None or end == len(buf) or buf[end] not in ELEMENT_TERMINATORS:
+                more = f.read(chunk_size)
+                if more:
+                    buf, pos = buf[pos:] + more, 0
+                    continue
+                if end is None:
+                    raise ValueError("Invalid or truncated element in JSON array")
+            break
+
+        pos = end
+        yield value
+
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of input inside JSON array")
+        separator = buf[pos]
+        pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+
+
+def iter_raw_records(path):
+    """
+    Yield records from a raw file in either JSON-array or NDJSON format,
+    reading incrementally in both cases.
+    """
+    _, output_format, _ = split_raw_path(path)
+
+    with open_raw(path, "r") as f:
+        if output_format == "ndjson":
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+            return
+
+        yield from iter_json_array(f)
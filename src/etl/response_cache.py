@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .logger import get_logger
+
+DEFAULT_CACHE_DIR = "data/raw/.cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+logger = get_logger("response_cache")
+
+
+def sha256_hex(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response built from a cached body.
+    """
+
+    def __init__(self, body, headers=None):
+        self.status_code = 200
+        self.content = body
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache for API responses.
+
+    Bodies live in objects/<sha256 of body>, so identical pages are stored
+    once. Each URL has a small entry in entries/<sha256 of url>.json with
+    the body hash and the ETag / Last-Modified validators used for
+    conditional requests. When the objects grow past `max_bytes`, the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_age=None):
+        """
+        @param max_bytes: size budget for cached bodies
+        @param max_age: seconds an entry is served without contacting the API;
+                        None always revalidates with a conditional request
+        """
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.size = sum(
+            os.path.getsize(os.path.join(self.objects_dir, name))
+            for name in os.listdir(self.objects_dir)
+        )
+
+    @property
+    def entries_dir(self):
+        return os.path.join(self.directory, "entries")
+
+    @property
+    def objects_dir(self):
+        return os.path.join(self.directory, "objects")
+
+    def entry_path(self, url):
+        return os.path.join(self.entries_dir, f"{sha256_hex(url)}.json")
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest)
+
+    def write_atomic(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def record(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def lookup(self, url):
+        """
+        Return the cache entry for a URL, or None if it isn't cached.
+        """
+        path = self.entry_path(url)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not os.path.exists(self.object_path(entry["body"])):
+            return None
+
+        # Entry mtime doubles as last-use time for LRU eviction
+        os.utime(path)
+        return entry
+
+    def is_fresh(self, entry):
+        if self.max_age is None:
+            return False
+        return time.time() - entry["stored_at"] < self.max_age
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def response_for(self, entry):
+        with open(self.object_path(entry["body"]), "rb") as f:
+            return CachedResponse(f.read(), headers={"Content-Type": "application/json"})
+
+    def refresh(self, url, entry):
+        """
+        Mark an entry as revalidated (after a 304) so max_age restarts.
+        """
+        entry["stored_at"] = time.time()
+        self.write_atomic(self.entry_path(url), json.dumps(entry).encode("utf-8"))
+
+    def store(self, url, resp):
+        body = resp.content
+        digest = sha256_hex(body)
+        object_path = self.object_path(digest)
+
+        with self.lock:
+            if not os.path.exists(object_path):
+                self.write_atomic(object_path, body)
+                self.size += len(body)
+
+        entry = {
+            "url": url,
+            "body": digest,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        self.write_atomic(self.entry_path(url), json.dumps(entry).encode("utf-8"))
+
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Drop least recently used entries until cached bodies fit in max_bytes.
+        """
+        with self.lock:
+            entries = []
+            refs = {}
+            for name in os.listdir(self.entries_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.entries_dir, name)
+                try:
+                    with open(path, "r") as f:
+                        digest = json.load(f)["body"]
+                    entries.append((os.path.getmtime(path), path, digest))
+                except (OSError, ValueError, KeyError):
+                    continue
+                refs[digest] = refs.get(digest, 0) + 1
+
+            evicted = 0
+            for _, path, digest in sorted(entries):
+                if self.size <= self.max_bytes:
+                    break
+                os.remove(path)
+                evicted += 1
+                refs[digest] -= 1
+                if refs[digest] == 0:
+                    object_path = self.object_path(digest)
+                    if os.path.exists(object_path):
+                        self.size -= os.path.getsize(object_path)
+                        os.remove(object_path)
+
+        logger.info(f"Evicted {evicted} cache entries; cache now {self.size} bytes")
+
+    def summary(self):
+        return (
+            f"{self.stats['hits']} hits, {self.stats['revalidated']} revalidated (304), "
+            f"{self.stats['misses']} misses"
+        )
@@ -1,10 +1,13 @@
 import time
 
 from src.etl.fetch_from_api import fetch_from_api
+from src.etl.projection import CSV_PROJECTION
 from src.etl.transform_to_csv import json_to_csv
 from src.etl.clean_csv import clean_newspapers_csv
+from src.etl.transform_and_clean import transform_and_clean
 from src.etl.create_tables import create_tables
 from src.etl.input_data_into_db import input_into_db
+from src.etl.watermark import advance_watermark
 from src.etl.make_charts import (
     issues_per_year,
     language_frequency,
@@ -13,23 +16,42 @@ from src.etl.make_charts import (
 )
 
 
-def run_pipeline():
+def run_pipeline(output_format="csv", fused=False, rebuild=False, incremental=False):
+    """
+    Run every ETL stage end to end.
+    @param output_format: "csv" or "parquet" for the processed and cleaned tables
+    @param fused: clean records straight out of the JSON extractor instead of
+                  writing and re-reading the processed CSV
+    @param rebuild: drop and recreate every table before loading, instead of
+                    migrating the existing schema and upserting into it
+    @param incremental: fetch only records issued since the watermark, and
+                        advance the watermark once they are loaded
+    """
     print("\n --- ETL PIPELINE STARTED ---")
     print("\n")
     print("\n")
     print("\n--- FETCHING DATA FROM API ---")
-    fetch_from_api(collection="newspapers", max_pages=2)
-    print("\n--- TRANSFORMING JSON → CSV...")
-    json_to_csv("data/raw/newspapers_raw.json")
-    time.sleep(1)
-    print("\n--- CLEANING CSV DATA...")
-    clean_newspapers_csv()
-    time.sleep(1)
-    print("\n--- CREATING DATABASE TABLES...") 
-    create_tables()
+    raw_path = fetch_from_api(collection="newspapers", max_pages=2, use_cache=True, projection=CSV_PROJECTION,
+                              incremental=incremental)
+    if fused:
+        print("\n--- TRANSFORMING + CLEANING JSON...")
+        cleaned_path = transform_and_clean(raw_path, output_format=output_format)
+        time.sleep(1)
+    else:
+        print("\n--- TRANSFORMING JSON → CSV...")
+        processed_path = json_to_csv(raw_path, output_format=output_format)
+        time.sleep(1)
+        print("\n--- CLEANING CSV DATA...")
+        cleaned_path = clean_newspapers_csv(input_path=processed_path, output_format=output_format)
+        time.sleep(1)
+    print("\n--- MIGRATING DATABASE SCHEMA...")
+    create_tables(rebuild=rebuild)
     time.sleep(1)
     print("\n--- INPUTTING DATA INTO DATABASE...")
-    input_into_db()
+    input_into_db(input_path=cleaned_path)
+    if incremental:
+        # Only now are the fetched records safely in the database
+        advance_watermark("newspapers", raw_path)
     time.sleep(1)
     print("\n--- GENERATING CHARTS...")
     issues_per_year()
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from .logger import get_logger
+
+logger = get_logger("seen_ids")
+
+# Independent key for the check hash; hash_pandas_object wants exactly 16 characters
+CHECK_HASH_KEY = "seen-ids-check!!"
+
+
+def hash_ids(ids, hash_key=None):
+    kwargs = {"hash_key": hash_key} if hash_key else {}
+    return pd.util.hash_pandas_object(ids.astype(str), index=False, **kwargs).to_numpy()
+
+
+class SeenIds:
+    """
+    Compact seen-ID index for deduplicating across chunks.
+
+    Each id is stored as two independent 64-bit hashes (16 bytes) in sorted
+    numpy runs: a key hash to search on and a check hash that confirms a hit.
+    Ids whose key hashes collide but whose check hashes differ are kept as
+    distinct, counted in `collisions` and logged. New runs are merged into
+    older ones once they grow to a similar size, so there are only O(log n)
+    runs to search and each hash is copied O(log n) times overall.
+
+    Missing ids are tracked by a flag rather than hashed, so they never match
+    a real id; like drop_duplicates(keep="first") they count as one value.
+    """
+
+    def __init__(self):
+        self.runs = []
+        self.seen_missing = False
+        self.collisions = 0
+
+    def __len__(self):
+        return sum(len(keys) for keys, _ in self.runs) + int(self.seen_missing)
+
+    def contains(self, keys, checks):
+        """
+        Returns (found, collided): ids already stored, and ids whose key hash
+        is stored but only under a different check hash.
+        """
+        found = np.zeros(len(keys), dtype=bool)
+        key_hit = np.zeros(len(keys), dtype=bool)
+        for run_keys, run_checks in self.runs:
+            left = np.searchsorted(run_keys, keys, side="left")
+            right = np.searchsorted(run_keys, keys, side="right")
+            hit = right > left
+            single = hit & (right - left == 1)
+            match = np.zeros(len(keys), dtype=bool)
+            match[single] = run_checks[left[single]] == checks[single]
+            # A key hash stored more than once means earlier colliding ids; check each
+            for i in np.flatnonzero(hit & ~single):
+                match[i] = (run_checks[left[i]:right[i]] == checks[i]).any()
+            found |= match
+            key_hit |= hit
+        return found, key_hit & ~found
+
+    def add(self, keys, checks):
+        if len(keys) == 0:
+            return
+        self.runs.append(unique_pairs(keys, checks))
+        while len(self.runs) > 1 and len(self.runs[-2][0]) <= 2 * len(self.runs[-1][0]):
+            newest_keys, newest_checks = self.runs.pop()
+            older_keys, older_checks = self.runs[-1]
+            self.runs[-1] = unique_pairs(np.concatenate([older_keys, newest_keys]),
+                                         np.concatenate([older_checks, newest_checks]))
+
+    def first_seen(self, ids):
+        """
+        Mask of ids seen for the first time, within this batch and across all
+        earlier ones, like drop_duplicates(keep="first").
+        """
+        missing = ids.isna().to_numpy()
+        present = ids[~missing]
+        keys = hash_ids(present)
+        checks = hash_ids(present, CHECK_HASH_KEY)
+
+        pairs = pd.DataFrame({"key": keys, "check": checks})
+        repeated = pairs.duplicated().to_numpy()
+        found, collided = self.contains(keys, checks)
+        fresh = ~repeated & ~found
+        collided = fresh & (collided | pairs["key"].duplicated().to_numpy())
+        self.add(keys[fresh], checks[fresh])
+
+        if collided.any():
+            self.collisions += int(collided.sum())
+            logger.warning(f"{int(collided.sum())} id(s) share a 64-bit key hash with a different id; "
+                           f"kept them as distinct ({self.collisions} so far).")
+
+        mask = np.zeros(len(ids), dtype=bool)
+        mask[~missing] = fresh
+        if missing.any() and not self.seen_missing:
+            mask[np.flatnonzero(missing)[0]] = True
+            self.seen_missing = True
+        return mask
+
+
+def unique_pairs(keys, checks):
+    """Sort (key, check) pairs by key and drop repeated pairs."""
+    order = np.lexsort((checks, keys))
+    keys, checks = keys[order], checks[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (checks[1:] != checks[:-1])
+    return keys[keep], checks[keep]
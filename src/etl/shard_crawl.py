@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .fetch_from_api import fetch_from_api
+from .logger import get_logger
+from .raw_io import iter_raw_records
+
+raw_data_saved_dir = "data/raw"
+
+logger = get_logger("shard_crawl")
+
+
+def plan_date_shards(start_year, end_year, shard_count):
+    """
+    Split [start_year, end_year] into up to `shard_count` contiguous year ranges.
+    Each shard is {"name": ..., "params": {...}} with a LOC `dates` filter.
+    """
+    years = end_year - start_year + 1
+    if years <= 0 or shard_count <= 0:
+        raise ValueError("Need start_year <= end_year and a positive shard_count")
+
+    shard_count = min(shard_count, years)
+    size, extra = divmod(years, shard_count)
+
+    shards = []
+    first = start_year
+    for i in range(shard_count):
+        last = first + size - 1 + (1 if i < extra else 0)
+        shards.append({"name": f"{first}-{last}", "params": {"dates": f"{first}/{last}"}})
+        first = last + 1
+
+    return shards
+
+
+def plan_facet_shards(facet, values):
+    """
+    One shard per facet value, e.g. plan_facet_shards("location_state", ["ohio", "iowa"]).
+    """
+    shards = []
+    for value in values:
+        slug = re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-")
+        shards.append({"name": f"{facet}-{slug}", "params": {"fa": f"{facet}:{value}"}})
+    return shards
+
+
+def crawl_shard(collection, shard, output_dir, fetch_kwargs):
+    """
+    Worker entry point: crawl one shard into its own raw file and describe it.
+    """
+    output_name = f"{collection}_{shard['name']}"
+    path = fetch_from_api(
+        collection=collection,
+        params=shard["params"],
+        output_name=output_name,
+        output_dir=output_dir,
+        **fetch_kwargs,
+    )
+
+    records = sum(1 for _ in iter_raw_records(path))
+    logger.info(f"Shard {shard['name']} wrote {records} records to {path}")
+
+    return {"shard": shard["name"], "params": shard["params"], "path": path, "records": records}
+
+
+def manifest_path(collection, shard_index=0, shard_count=1, output_dir=raw_data_saved_dir):
+    return os.path.join(output_dir, f"{collection}_manifest_{shard_index + 1}of{shard_count}.json")
+
+
+def write_manifest(collection, entries, path):
+    manifest = {
+        "collection": collection,
+        "shards": entries,
+        "total_records": sum(entry["records"] for entry in entries),
+    }
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def run_sharded_crawl(collection, shards, workers=None, shard_index=0, shard_count=1,
+                      output_dir=None, rate=None, **fetch_kwargs):
+    """
+    Crawl shards in separate worker processes, each writing its own raw file.
+    @param workers: process count (defaults to the CPU count)
+    @param shard_index / shard_count: this box's slice of `shards`, so a backfill
+                                      can be spread across machines and merged later
+    @param rate: total requests per second for this box (defaults to 1 / delay).
+                 Every process has its own token bucket, so each gets an equal share
+    @param fetch_kwargs: forwarded to fetch_from_api; NDJSON output is the default
+    Returns the path of this box's manifest.
+    """
+    output_dir = output_dir or raw_data_saved_dir
+    fetch_kwargs.setdefault("output_format", "ndjson")
+
+    mine = shards[shard_index::shard_count]
+
+    delay = fetch_kwargs.get("delay", 1)
+    rate = rate or (1 / delay if delay > 0 else None)
+    if rate:
+        processes = max(1, min(workers or os.cpu_count(), len(mine)))
+        fetch_kwargs["rate"] = rate / processes
+        logger.info(f"Limiting each of {processes} processes to {fetch_kwargs['rate']:.3f} req/s ({rate} total)")
+    logger.info(f"Crawling {len(mine)} of {len(shards)} shards for '{collection}' "
+                f"(slice {shard_index + 1}/{shard_count}, workers={workers})")
+    print(f"Crawling {len(mine)} shards with {workers or os.cpu_count()} workers")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(crawl_shard, collection, shard, output_dir, fetch_kwargs) for shard in mine]
+        # Collect in shard order so the manifest is deterministic
+        entries = [future.result() for future in futures]
+
+    path = manifest_path(collection, shard_index, shard_count, output_dir)
+    manifest = write_manifest(collection, entries, path)
+
+    print(f"Saved manifest for {len(entries)} shards ({manifest['total_records']} records) to {path}")
+    logger.info(f"Saved manifest for {len(entries)} shards to {path}")
+
+    return path
+
+
+def merge_manifests(paths, output_path):
+    """
+    Merge per-box manifests into one, ordered by shard name.
+    """
+    entries = []
+    collection = None
+
+    for path in paths:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        if collection is not None and manifest["collection"] != collection:
+            raise ValueError(f"Manifest {path} is for '{manifest['collection']}', expected '{collection}'")
+        collection = manifest["collection"]
+        entries.extend(manifest["shards"])
+
+    entries.sort(key=lambda entry: entry["shard"])
+    manifest = write_manifest(collection, entries, output_path)
+
+    logger.info(f"Merged {len(paths)} manifests ({len(entries)} shards) into {output_path}")
+    print(f"Merged {len(entries)} shards ({manifest['total_records']} records) into {output_path}")
+
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded LOC crawl across year ranges.")
+    parser.add_argument("--collection", default="newspapers")
+    parser.add_argument("--start-year", type=int, default=1770)
+    parser.add_argument("--end-year", type=int, default=1963)
+    parser.add_argument("--shards", type=int, default=os.cpu_count())
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--shard-index", type=int, default=0)
+    parser.add_argument("--shard-count", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=None,
+                        help="total requests per second across all workers (default 1)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="checkpoint every page so an interrupted shard resumes on rerun")
+    parser.add_argument("--merge", nargs="+", metavar="MANIFEST",
+                        help="merge existing manifests instead of crawling")
+    args = parser.parse_args()
+
+    if args.merge:
+        merge_manifests(args.merge, os.path.join(raw_data_saved_dir, f"{args.collection}_manifest.json"))
+        return
+
+    shards = plan_date_shards(args.start_year, args.end_year, args.shards)
+    run_sharded_crawl(
+        args.collection, shards, workers=args.workers,
+        shard_index=args.shard_index, shard_count=args.shard_count,
+        max_pages=args.max_pages, rate=args.rate, checkpoint=args.checkpoint,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for Parquet output and parallel cleaning
+    pa = None
+    feather = None
+    pq = None
+
+TABLE_FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+
+# Only empty CSV cells are missing values. Text such as "NA" or "null" stays
+# text, as it does in Parquet and in the fused transform + clean stage
+CSV_NA_OPTIONS = {"keep_default_na": False, "na_values": [""]}
+
+# Low-cardinality text columns worth dictionary-encoding in Parquet
+DICTIONARY_COLUMNS = [
+    "language", "subject", "location_city", "location_state", "location_country",
+    "item_medium", "item_language", "item_created_published",
+    "item_newspaper_title", "item_lccn", "item_place_of_publication",
+]
+
+
+def is_list_value(value):
+    """
+    List cells come back from Parquet as numpy arrays, from the extractor as lists.
+    """
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+def encode_list_cell(values):
+    """
+    CSV text for a multi-valued cell: a JSON array, so values may contain commas.
+    """
+    return json.dumps(values, ensure_ascii=False)
+
+
+def list_cell_values(value):
+    """
+    Values of one multi-valued cell: Parquet lists as they are, JSON-array text
+    from CSV decoded. Other non-blank text (e.g. a hand-edited CSV) is a single
+    value.
+    """
+    if is_list_value(value):
+        return [str(v) for v in value]
+    if value is None or (isinstance(value, float) and pd.isna(value)) or str(value).strip() == "":
+        return []
+    text = str(value).strip()
+    if text.startswith("["):
+        try:
+            decoded = json.loads(text)
+        except ValueError:
+            decoded = None
+        if isinstance(decoded, list):
+            return [str(v) for v in decoded]
+    return [text]
+
+
+def is_categorical_dtype(series):
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet output requires the 'pyarrow' package")
+
+
+def table_format(path):
+    return "parquet" if str(path).endswith(TABLE_FORMATS["parquet"]) else "csv"
+
+
+def with_format(path, output_format):
+    """
+    Swap a table path's extension for the given format, keeping its type (str or Path).
+    """
+    if output_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format '{output_format}'. Expected one of {list(TABLE_FORMATS)}")
+
+    new_path = Path(path).with_suffix(TABLE_FORMATS[output_format])
+    return new_path if isinstance(path, Path) else str(new_path)
+
+
+def read_table(path, columns=None, categories=()):
+    """
+    Load a CSV or Parquet table; `columns` prunes what is read from disk.
+    @param categories: columns to load as pandas categoricals
+    """
+    if table_format(path) == "parquet":
+        require_pyarrow()
+        return pd.read_parquet(path, columns=columns, read_dictionary=list(categories) or None)
+    return pd.read_csv(path, usecols=columns, dtype={c: "category" for c in categories}, **CSV_NA_OPTIONS)
+
+
+def iter_table(path, chunksize, columns=None, categories=()):
+    """
+    Yield a CSV or Parquet table as DataFrames of at most `chunksize` rows.
+    @param categories: columns to load as pandas categoricals
+    """
+    if table_format(path) == "parquet":
+        require_pyarrow()
+        parquet_file = pq.ParquetFile(path, read_dictionary=list(categories) or None)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(path, usecols=columns, chunksize=chunksize,
+                           dtype={c: "category" for c in categories}, **CSV_NA_OPTIONS)
+
+
+def list_columns(path):
+    """
+    Names of list-typed columns in a table file; CSV has none.
+    """
+    if table_format(path) != "parquet":
+        return []
+    require_pyarrow()
+    schema = pq.read_schema(path)
+    return [field.name for field in schema if pa.types.is_list(field.type)]
+
+
+def write_table(df, path):
+    """
+    Write a DataFrame as CSV or Parquet depending on the path's extension.
+    Parquet keeps column types and dictionary-encodes low-cardinality text.
+    """
+    if table_format(path) == "parquet":
+        require_pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Categoricals are stored as plain strings; Parquet's own dictionary
+        # encoding below keeps them compact on disk
+        table = table.cast(pa.schema([
+            field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ], metadata=table.schema.metadata))
+        dictionary = [c for c in DICTIONARY_COLUMNS if c in table.column_names]
+        pq.write_table(table, path, use_dictionary=dictionary, compression="zstd")
+        return
+    df.to_csv(path, index=False)
+
+
+class TableAppender:
+    """
+    Appends DataFrame chunks to one CSV or Parquet file.
+    The Parquet schema is fixed up front rather than inferred from the first
+    chunk, which may hold a column that is blank in every row: `list_columns`
+    are list<string>, `types` gives any other non-string columns, and the
+    rest are strings (categoricals included, since each chunk has its own
+    categories; Parquet dictionary-encodes them on disk).
+    """
+
+    def __init__(self, path, list_columns=(), types=None):
+        self.path = str(path)
+        self.list_columns = list_columns
+        self.types = types or {}
+        self.writer = None
+        self.started = False
+
+    def parquet_schema(self, df):
+        return pa.schema([
+            (name, pa.list_(pa.string()) if name in self.list_columns else self.types.get(name, pa.string()))
+            for name in df.columns
+        ])
+
+    def conform(self, df, schema):
+        """
+        Make each column convertible to its schema type: all-null columns read
+        as float become None, and non-text values in string columns become text.
+        """
+        df = df.copy()
+        for field in schema:
+            series = df[field.name]
+            if series.dtype == object or is_categorical_dtype(series):
+                continue
+            if series.isna().all():
+                df[field.name] = pd.Series([None] * len(series), index=series.index, dtype=object)
+            elif pa.types.is_string(field.type):
+                df[field.name] = series.astype(object).where(series.notna(), None).map(
+                    lambda v: v if v is None else str(v))
+        return df
+
+    def append(self, df):
+        if table_format(self.path) == "parquet":
+            require_pyarrow()
+            if self.writer is None:
+                schema = self.parquet_schema(df)
+                dictionary = [c for c in DICTIONARY_COLUMNS if c in schema.names]
+                self.writer = pq.ParquetWriter(self.path, schema, use_dictionary=dictionary, compression="zstd")
+            df = self.conform(df, self.writer.schema)
+            self.writer.write_table(pa.Table.from_pandas(df, schema=self.writer.schema, preserve_index=False))
+        else:
+            df.to_csv(self.path, mode="a" if self.started else "w", header=not self.started, index=False)
+        self.started = True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetRowWriter:
+    """
+    Streams row tuples into a Parquet file in fixed-size record batches,
+    so the transform stage keeps constant memory with columnar output.
+    """
+
+    def __init__(self, path, columns, types=None, batch_size=10_000):
+        """
+        @param types: optional {column: pyarrow type}; other columns are strings
+        """
+        require_pyarrow()
+        types = types or {}
+        self.columns = columns
+        self.schema = pa.schema([(c, types.get(c, pa.string())) for c in columns])
+        self.batch_size = batch_size
+        self.rows = []
+        dictionary = [c for c in DICTIONARY_COLUMNS if c in columns]
+        self.writer = pq.ParquetWriter(str(path), self.schema, use_dictionary=dictionary, compression="zstd")
+
+    def write_row(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        columns = list(zip(*self.rows))
+        arrays = [
+            pa.array([coerce(value, field.type) for value in values], type=field.type)
+            for values, field in zip(columns, self.schema)
+        ]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def coerce(value, arrow_type):
+    """
+    Match what a CSV round trip gives pandas: blanks become nulls, the rest typed.
+    """
+    if pa.types.is_list(arrow_type):
+        if is_list_value(value):
+            return [str(v) for v in value]
+        return None if value is None or value == "" else [str(value)]
+    if value is None or value == "":
+        return None
+    if pa.types.is_boolean(arrow_type):
+        return value if isinstance(value, bool) else str(value).strip().lower() == "true"
+    return value if isinstance(value, str) else str(value)
@@ -0,0 +1,225 @@
+import csv
+import os
+
+import pandas as pd
+
+from . import clean_csv
+from .clean_csv import (
+    EMPTY_LIST_CELL,
+    FILL_UNKNOWN_FIELDS,
+    INVALID_DATE,
+    LOWERCASE_FIELDS,
+    NORMALIZED_DATE_COLUMN,
+    REJECT_REASON_COLUMN,
+    REJECTION_RULES,
+    UNKNOWN,
+    is_blank,
+    log_stats,
+    lowercase_value,
+    normalize_date,
+    new_stats,
+    print_summary,
+    profile_path,
+)
+from .logger import get_logger
+from .profiler import DataProfile
+from .raw_io import iter_raw_records
+from .table_io import TABLE_FORMATS, ParquetRowWriter, with_format
+from .transform_to_csv import CSV_FIELDS, LIST_FIELDS, PARQUET_TYPES, extract_list_row, extract_row
+
+logger = get_logger("transform_and_clean")
+
+COLUMN_INDEX = {name: i for i, name in enumerate(CSV_FIELDS)}
+
+# Cleaned rows buffered before each profile update
+PROFILE_BATCH_ROWS = 10_000
+
+
+class TableWriter:
+    """
+    Row sink for the cleaned / rejected outputs, as CSV or Parquet.
+    CSV rows are written the way DataFrame.to_csv writes them.
+    """
+
+    def __init__(self, path, output_format, columns=CSV_FIELDS):
+        self.path = str(path)
+        self.tmp_path = self.path + ".tmp"
+        self.count = 0
+        self.closed = False
+        if output_format == "parquet":
+            self.file = None
+            self.writer = ParquetRowWriter(self.tmp_path, columns, PARQUET_TYPES)
+        else:
+            self.file = open(self.tmp_path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.file, lineterminator="\n")
+            self.writer.writerow(columns)
+
+    def write_row(self, row):
+        if self.file is None:
+            self.writer.write_row(row)
+        else:
+            self.writer.writerow(row)
+        self.count += 1
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.file is None:
+            self.writer.close()
+        else:
+            self.file.close()
+
+    def commit(self):
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def rejection_reason(row):
+    """
+    Apply REJECTION_RULES to one extracted row, in order.
+    Returns (reason code, stats key) for the first rule it fails, or (None, None).
+    """
+    for reason, stats_key, field in REJECTION_RULES:
+        value = row[COLUMN_INDEX[field]]
+        failed = normalize_date(value) is None if reason == INVALID_DATE else is_blank(value)
+        if failed:
+            return reason, stats_key
+
+    return None, None
+
+
+def normalize_row(row, stats, list_fields=()):
+    """
+    Fill missing non-critical fields and lowercase text fields in place.
+    @param list_fields: columns carried as lists, filled with []; other list
+                        fields are JSON-array text, filled with "[]"
+    """
+    for field in FILL_UNKNOWN_FIELDS:
+        i = COLUMN_INDEX[field]
+        if is_blank(row[i]):
+            if field in list_fields:
+                row[i] = []
+            else:
+                row[i] = EMPTY_LIST_CELL if field in LIST_FIELDS else UNKNOWN
+            stats["placeholder_fills"][field] = stats["placeholder_fills"].get(field, 0) + 1
+
+    for field in LOWERCASE_FIELDS:
+        i = COLUMN_INDEX[field]
+        # Blank cells are nulls once a CSV is read back, so they are not counted
+        if row[i] is not None and row[i] != "":
+            row[i] = lowercase_value(row[i])
+            stats["lowercase_ops"][field] += 1
+
+
+def profile_frame(rows, columns):
+    """
+    Cleaned rows as a frame for DataProfile, with blank cells as nulls the way
+    clean_newspapers_csv sees them after reading the processed table.
+    """
+    return pd.DataFrame(rows, columns=columns).replace("", None)
+
+
+def transform_and_clean(input_json_path, output_format="csv", profile=True):
+    """
+    Fused transform + clean: run the cleaning rules on records as they come out
+    of the extractor and write the cleaned and rejected outputs directly,
+    skipping the intermediate processed CSV. Outputs, stats and profile match
+    json_to_csv followed by clean_newspapers_csv.
+    @param output_format: "csv" or "parquet" for the cleaned + rejected outputs
+    @param profile: write the data profile of the cleaned rows next to the output
+    Returns the cleaned output path.
+    """
+    if output_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of {list(TABLE_FORMATS)}")
+
+    logger.info(f"Starting fused transform + clean: {input_json_path}")
+    print("\n--- TRANSFORMING + CLEANING NEWSPAPERS ---\n")
+
+    # Read through the module so tests can redirect the output paths
+    cleaned_file = with_format(clean_csv.CLEANED_FILE, output_format)
+    rejected_file = with_format(clean_csv.REJECTED_FILE, output_format)
+    clean_csv.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    stats = new_stats()
+    stats["lowercase_ops"] = {field: 0 for field in LOWERCASE_FIELDS}
+    seen_ids = set()
+    data_profile = DataProfile() if profile else None
+    profile_batch = []
+    original_count = 0
+    removed_duplicates = 0
+
+    # Parquet keeps multi-valued fields as lists; CSV joins them
+    extract, list_fields = (extract_list_row, LIST_FIELDS) if output_format == "parquet" else (extract_row, ())
+    cleaned_columns = CSV_FIELDS + [NORMALIZED_DATE_COLUMN]
+    cleaned = TableWriter(cleaned_file, output_format, cleaned_columns)
+    rejected = TableWriter(rejected_file, output_format, CSV_FIELDS + [REJECT_REASON_COLUMN])
+
+    try:
+        for record in iter_raw_records(input_json_path):
+            row = list(extract(record))
+            original_count += 1
+
+            # Blank ids count as one value, like NaN in drop_duplicates
+            record_id = row[COLUMN_INDEX["id"]] or None
+            if record_id in seen_ids:
+                removed_duplicates += 1
+                continue
+            seen_ids.add(record_id)
+
+            reason, stats_key = rejection_reason(row)
+            if reason is not None:
+                stats[stats_key] += 1
+                stats["reject_reasons"][reason] = stats["reject_reasons"].get(reason, 0) + 1
+                row.append(reason)
+                rejected.write_row(row)
+                continue
+
+            normalize_row(row, stats, list_fields)
+            # Cached by the date rule above
+            row.append(normalize_date(row[COLUMN_INDEX["item_date_issued"]]))
+            cleaned.write_row(row)
+
+            if data_profile is not None:
+                profile_batch.append(row)
+                if len(profile_batch) >= PROFILE_BATCH_ROWS:
+                    data_profile.update(profile_frame(profile_batch, cleaned_columns))
+                    profile_batch = []
+
+        if data_profile is not None and profile_batch:
+            data_profile.update(profile_frame(profile_batch, cleaned_columns))
+
+        cleaned.close()
+        rejected.close()
+        cleaned.commit()
+        rejected.commit()
+
+    except Exception as e:
+        logger.error(f"Fused transform + clean failed for {input_json_path}: {e}")
+        raise
+    finally:
+        cleaned.close()
+        rejected.close()
+        cleaned.discard()
+        rejected.discard()
+
+    logger.info(f"Rows before cleaning: {original_count}")
+    logger.info(f"Removed {removed_duplicates} duplicate ID rows.")
+    logger.info(f"Rejected {rejected.count} rows "
+                f"({stats['missing_critical_rows']} critical, {stats['invalid_date_rows']} date, "
+                f"{stats['missing_location_rows']} location).")
+    log_stats(stats)
+    logger.info(f"Saved cleaned output → {cleaned_file}")
+    logger.info(f"Saved rejected output → {rejected_file}")
+    if data_profile is not None:
+        data_profile.write(profile_path(cleaned_file))
+
+    print_summary(original_count, removed_duplicates, rejected.count, cleaned.count,
+                  stats, cleaned_file, rejected_file)
+
+    logger.info("Fused transform + clean completed successfully.")
+
+    return cleaned_file
@@ -1,13 +1,60 @@
 import csv
+import glob
 import json
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from .logger import get_logger 
+from .raw_io import is_raw_file, iter_raw_records, split_raw_path
+from .table_io import TABLE_FORMATS, ParquetRowWriter, encode_list_cell, pa, pq
 
 RAW_DIR = "data/raw"
 PROCESSED_DIR = "data/processed"
 
 logger = get_logger("json_to_csv")
 
+
+def first_image_url(value):
+    return value.split(", ")[0] if value else ""
+
+
+# Declarative CSV schema: (column, path into the LOC record, post-processing).
+# A one-element path reads a top-level key, a two-element path reads a key of
+# a nested object. List values are joined with ", " before post-processing.
+FIELD_SPEC = [
+    ("id", ("id",), None),
+    ("title", ("title",), None),
+    ("date", ("date",), None),
+    ("description", ("description",), None),
+    ("digitized", ("digitized",), None),
+    ("language", ("language",), None),
+    ("subject", ("subject",), None),
+    ("location_city", ("location_city",), None),
+    ("location_state", ("location_state",), None),
+    ("location_country", ("location_country",), None),
+    ("image_url", ("image_url",), first_image_url),
+    ("url", ("url",), None),
+    # nested fields (inside 'item')
+    ("item_date_issued", ("item", "date_issued"), None),
+    ("item_created_published", ("item", "created_published"), None),
+    ("item_medium", ("item", "medium"), None),
+    ("item_language", ("item", "language"), None),
+    ("item_newspaper_title", ("item", "newspaper_title"), None),
+    ("item_lccn", ("item", "library_of_congress_control_number"), None),
+    ("item_place_of_publication", ("item", "place_of_publication"), None),
+]
+
+CSV_FIELDS = [column for column, _, _ in FIELD_SPEC]
+
+# Multi-valued fields: kept as real lists in Parquet and written as JSON arrays
+# in CSV, since values themselves contain commas ("oakwood (montgomery county, ohio)")
+LIST_FIELDS = ["language", "subject", "item_language"]
+
+# Non-string column types for Parquet output
+PARQUET_TYPES = {"digitized": pa.bool_()} if pa is not None else {}
+if pa is not None:
+    PARQUET_TYPES.update({column: pa.list_(pa.string()) for column in LIST_FIELDS})
+
 def safe_get(obj, key, default=""): 
     if key not in obj:
         return default
@@ -37,92 +84,239 @@ def safe_get_nested(obj, parent, key, default=""):
         return ", ".join(str(v) for v in val)
     return val
 
-def json_to_csv(input_json_path):
-    logger.info(f"Starting JSON → CSV conversion: {input_json_path}")
+def compile_extractor(spec, as_dict=False, list_columns=(), json_columns=()):
+    """
+    Compile a field spec into a single extractor function.
 
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
-    logger.info(f"Ensured processed directory exists: {PROCESSED_DIR}")
+    The generated code looks each nested parent up once, inlines the
+    safe_get / safe_get_nested rules per field and returns a tuple in spec
+    order (or a dict keyed by column with as_dict=True).
+    @param list_columns: columns returned as lists of strings instead of
+                         joined text; missing or empty values become None
+    @param json_columns: columns returned as JSON-array text instead of joined
+                         text; missing or empty values become ""
+    """
+    parents = []
+    for _, path, _ in spec:
+        if len(path) == 2 and path[0] not in parents:
+            parents.append(path[0])
+        elif len(path) not in (1, 2):
+            raise ValueError(f"Field paths must have one or two keys, got {path}")
 
-    try:
-        with open(input_json_path, "r") as f:
-            data = json.load(f)
-        logger.info(f"Loaded JSON file successfully: {input_json_path}")
-    except Exception as e:
-        logger.error(f"Failed to load JSON file {input_json_path}: {e}")
-        raise
+    namespace = {"_EMPTY": {}, "_list": list, "_dumps": encode_list_cell}
+    lines = ["def extract(record):"]
 
-    if not isinstance(data, list):
-        logger.error("Input JSON root is not a list of objects.")
-        raise ValueError("Input JSON should be a list of objects")
-
-    # Define columns for the CSV
-    fields = [
-        "id",
-        "title",
-        "date",
-        "description",
-        "digitized",
-        "language",
-        "subject",
-        "location_city",
-        "location_state",
-        "location_country",
-        "image_url",
-        "url",
-        # nested fields (inside 'item')
-        "item_date_issued",
-        "item_created_published",
-        "item_medium",
-        "item_language",
-        "item_newspaper_title",
-        "item_lccn",
-        "item_place_of_publication",
-    ]
-
-    csv_name = input_json_path.replace(RAW_DIR + "/", "").replace("_raw.json", ".csv")
-    csv_path = os.path.join(PROCESSED_DIR, csv_name)
+    for i, parent in enumerate(parents):
+        lines.append(f"    p{i} = record.get({parent!r}, _EMPTY)")
+        lines.append(f"    if not isinstance(p{i}, dict): p{i} = _EMPTY")
 
-    logger.info(f"Preparing to write CSV to: {csv_path}")
+    for j, (column, path, post) in enumerate(spec):
+        source = "record" if len(path) == 1 else f"p{parents.index(path[0])}"
+        lines.append(f"    v = {source}.get({path[-1]!r}, '')")
+        if column in list_columns:
+            lines.append("    if isinstance(v, _list): v = [str(x) for x in v] or None")
+            lines.append("    elif v is None or v == '': v = None")
+            lines.append("    else: v = [str(v)]")
+        elif column in json_columns:
+            lines.append("    if isinstance(v, _list): v = _dumps([str(x) for x in v]) if v else ''")
+            lines.append("    elif v is not None and v != '': v = _dumps([str(v)])")
+        else:
+            lines.append("    if isinstance(v, _list): v = ', '.join([str(x) for x in v]) if v else ''")
+        if post is not None:
+            namespace[f"_post{j}"] = post
+            lines.append(f"    v = _post{j}(v)")
+        lines.append(f"    c{j} = v")
+
+    if as_dict:
+        items = ", ".join(f"{column!r}: c{j}" for j, (column, _, _) in enumerate(spec))
+        lines.append(f"    return {{{items}}}")
+    else:
+        lines.append(f"    return ({', '.join(f'c{j}' for j in range(len(spec)))},)")
+
+    exec("\n".join(lines), namespace)
+    return namespace["extract"]
+
+
+extract_row = compile_extractor(FIELD_SPEC, json_columns=LIST_FIELDS)
+extract_list_row = compile_extractor(FIELD_SPEC, list_columns=LIST_FIELDS)
+
+
+def write_processed(input_json_path, csv_path, output_format="csv"):
+    """
+    Stream one raw file through the extractor into `csv_path`.
+    Returns the number of rows written.
+    """
+    records = iter_raw_records(input_json_path)
+
+    # Write to a temp file so a bad record never leaves a half-written CSV behind
+    tmp_path = str(csv_path) + ".tmp"
+    row_count = 0
 
     try:
-        with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fields)
-            writer.writeheader()
-
-            for item in data:
-                row = {
-                    "id": safe_get(item, "id"),
-                    "title": safe_get(item, "title"),
-                    "date": safe_get(item, "date"),
-                    "description": safe_get(item, "description"),
-                    "digitized": safe_get(item, "digitized"),
-                    "language": safe_get(item, "language"),
-                    "subject": safe_get(item, "subject"),
-                    "location_city": safe_get(item, "location_city"),
-                    "location_state": safe_get(item, "location_state"),
-                    "location_country": safe_get(item, "location_country"),
-                    "image_url": safe_get(item, "image_url").split(", ")[0]
-                    if safe_get(item, "image_url")
-                    else "",
-                    "url": safe_get(item, "url"),
-                    "item_date_issued": safe_get_nested(item, "item", "date_issued"),
-                    "item_created_published": safe_get_nested(item, "item", "created_published"),
-                    "item_medium": safe_get_nested(item, "item", "medium"),
-                    "item_language": safe_get_nested(item, "item", "language"),
-                    "item_newspaper_title": safe_get_nested(item, "item", "newspaper_title"),
-                    "item_lccn": safe_get_nested(item, "item", "library_of_congress_control_number"),
-                    "item_place_of_publication": safe_get_nested(item, "item", "place_of_publication"),
-                }
-
-                writer.writerow(row)
-
-        logger.info(f"Successfully wrote CSV file: {csv_path}")
+        if output_format == "parquet":
+            with ParquetRowWriter(tmp_path, CSV_FIELDS, PARQUET_TYPES) as writer:
+                for item in records:
+                    writer.write_row(extract_list_row(item))
+                    row_count += 1
+        else:
+            with open(tmp_path, "w", newline="", encoding="utf-8") as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(CSV_FIELDS)
+
+                for item in records:
+                    writer.writerow(extract_row(item))
+                    row_count += 1
+
+        os.replace(tmp_path, csv_path)
+        logger.info(f"Successfully wrote CSV file: {csv_path} ({row_count} rows)")
 
+    except ValueError as e:
+        logger.error(f"Invalid raw JSON in {input_json_path}: {e}")
+        raise
     except Exception as e:
         logger.error(f"Failed writing CSV {csv_path}: {e}")
         raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return row_count
+
+
+def json_to_csv(input_json_path, output_format="csv"):
+    """
+    Convert a raw LOC file (JSON array or NDJSON, optionally .gz/.zst) into a CSV.
+    Records are parsed incrementally and written as they are read, so memory
+    stays flat regardless of the raw file's size.
+    @param output_format: "csv" or "parquet" (typed, dictionary-encoded columns)
+    """
+    if output_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of {list(TABLE_FORMATS)}")
+
+    logger.info(f"Starting JSON → CSV conversion: {input_json_path}")
+
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    logger.info(f"Ensured processed directory exists: {PROCESSED_DIR}")
+
+    stem, _, _ = split_raw_path(input_json_path)
+    csv_name = f"{stem}{TABLE_FORMATS[output_format]}"
+    csv_path = os.path.join(PROCESSED_DIR, csv_name)
+
+    logger.info(f"Preparing to write CSV to: {csv_path}")
+
+    write_processed(input_json_path, csv_path, output_format)
 
     print(f"CSV created at: {csv_path}")
     logger.info(f"CSV created at: {csv_path}")
 
     return csv_path
+
+
+def resolve_raw_inputs(inputs):
+    """
+    Expand a directory, glob pattern or list of paths into a sorted list of raw files.
+    """
+    if isinstance(inputs, (list, tuple)):
+        return [str(path) for path in inputs]
+
+    inputs = str(inputs)
+    if os.path.isdir(inputs):
+        paths = [os.path.join(inputs, name) for name in os.listdir(inputs) if is_raw_file(name)]
+    else:
+        paths = glob.glob(inputs)
+
+    return sorted(paths)
+
+
+def transform_shard(input_path, output_path, output_format):
+    """
+    Worker entry point for json_to_csv_batch.
+    """
+    return write_processed(input_path, output_path, output_format)
+
+
+def merge_shards(shard_paths, output_path, output_format):
+    """
+    Concatenate shard outputs in the given order into one processed file.
+    """
+    tmp_path = str(output_path) + ".tmp"
+
+    if output_format == "parquet":
+        with ParquetRowWriter(tmp_path, CSV_FIELDS, PARQUET_TYPES) as writer:
+            for shard_path in shard_paths:
+                writer.writer.write_table(pq.read_table(shard_path).cast(writer.schema))
+    else:
+        with open(tmp_path, "wb") as out:
+            out.write(shard_header(shard_paths))
+            for shard_path in shard_paths:
+                with open(shard_path, "rb") as f:
+                    f.readline()  # header
+                    shutil.copyfileobj(f, out)
+
+    os.replace(tmp_path, output_path)
+
+
+def shard_header(shard_paths):
+    if shard_paths:
+        with open(shard_paths[0], "rb") as f:
+            return f.readline()
+    return (",".join(CSV_FIELDS) + "\r\n").encode("utf-8")
+
+
+def json_to_csv_batch(inputs, output_name="newspapers", output_format="csv", workers=None, merge=True):
+    """
+    Transform many raw files (page or shard outputs) in parallel across a process pool.
+    @param inputs: directory or glob (expanded in sorted order) or an ordered list of raw files
+    @param workers: process count (defaults to the CPU count)
+    @param merge: concatenate shard outputs in input order into <output_name>.<ext>;
+                  otherwise leave them in <output_name>_shards/ next to a manifest
+    Returns the merged file path, or the manifest path when merge=False.
+    """
+    if output_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of {list(TABLE_FORMATS)}")
+
+    input_paths = resolve_raw_inputs(inputs)
+    logger.info(f"Starting batch transform of {len(input_paths)} raw files (workers={workers})")
+    print(f"Transforming {len(input_paths)} raw files...")
+
+    shard_dir = os.path.join(PROCESSED_DIR, f"{output_name}_shards")
+    os.makedirs(shard_dir, exist_ok=True)
+
+    extension = TABLE_FORMATS[output_format]
+    shard_paths = []
+    for index, input_path in enumerate(input_paths):
+        stem, _, _ = split_raw_path(input_path)
+        # Index prefix keeps names unique and sorts in input order
+        shard_paths.append(os.path.join(shard_dir, f"{index:05d}_{stem}{extension}"))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(transform_shard, input_path, shard_path, output_format)
+            for input_path, shard_path in zip(input_paths, shard_paths)
+        ]
+        row_counts = [future.result() for future in futures]
+
+    manifest = {
+        "output_format": output_format,
+        "shards": [
+            {"input": input_path, "output": shard_path, "rows": rows}
+            for input_path, shard_path, rows in zip(input_paths, shard_paths, row_counts)
+        ],
+        "total_rows": sum(row_counts),
+    }
+    manifest_path = os.path.join(shard_dir, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    logger.info(f"Wrote batch manifest for {len(shard_paths)} shards to {manifest_path}")
+
+    if not merge:
+        print(f"Shard outputs + manifest saved to: {shard_dir}")
+        return manifest_path
+
+    merged_path = os.path.join(PROCESSED_DIR, f"{output_name}{extension}")
+    merge_shards(shard_paths, merged_path, output_format)
+
+    print(f"Merged {manifest['total_rows']} rows into: {merged_path}")
+    logger.info(f"Merged {len(shard_paths)} shards ({manifest['total_rows']} rows) into {merged_path}")
+
+    return merged_path
@@ -0,0 +1,123 @@
+import json
+import os
+from datetime import date
+
+from .create_tables import connect
+from .logger import get_logger
+from .raw_io import iter_raw_records
+
+logger = get_logger("watermark")
+
+
+def watermark_path(collection, directory="data/raw"):
+    return os.path.join(directory, f"{collection}_watermark.json")
+
+
+def read_db_watermark():
+    """
+    Newest date_issued already loaded into the issues table, as YYYY-MM-DD.
+    Returns None if the table is empty or the database can't be reached.
+    """
+    try:
+        conn = connect()
+        cur = conn.cursor()
+        cur.execute("SELECT MAX(date_issued) FROM issues;")
+        newest = cur.fetchone()[0]
+        cur.close()
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Could not read watermark from database: {e}")
+        return None
+
+    return newest.isoformat() if newest else None
+
+
+def read_stored_watermark(collection, directory="data/raw"):
+    path = watermark_path(collection, directory)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r") as f:
+        return json.load(f).get("date_issued")
+
+
+def load_watermark(collection, directory="data/raw"):
+    """
+    Watermark for an incremental fetch: the database is the source of truth
+    for what has been loaded; the stored file covers runs without a database.
+    """
+    newest = read_db_watermark()
+    if newest:
+        logger.info(f"Using database watermark {newest}")
+        return newest
+
+    newest = read_stored_watermark(collection, directory)
+    if newest:
+        logger.info(f"Using stored watermark {newest}")
+    return newest
+
+
+def save_watermark(collection, date_issued, directory="data/raw"):
+    path = watermark_path(collection, directory)
+    with open(path, "w") as f:
+        json.dump({"collection": collection, "date_issued": date_issued}, f)
+    logger.info(f"Saved watermark {date_issued} to {path}")
+
+
+def date_range_bounds(dates):
+    """
+    Inclusive YYYY-MM-DD bounds of a LOC `dates` filter: "1900/1909" or
+    "1900-01-01/1909-12-31" -> ("1900-01-01", "1909-12-31").
+    """
+    first, last = dates.split("/")
+    first = f"{first}-01-01" if len(first) == 4 else first
+    last = f"{last}-12-31" if len(last) == 4 else last
+    return first, last
+
+
+def incremental_params(since, dates=None):
+    """
+    LOC query parameters selecting records dated on/after `since`, oldest first.
+    The watermark day itself is re-requested; the loader's upsert absorbs repeats.
+    @param dates: an existing `dates` filter (e.g. a date shard's range); the
+                  result covers only the overlap of the two ranges
+    Returns None when `dates` ends before `since`, i.e. there is nothing to fetch.
+    """
+    first, last = since, date.today().isoformat()
+    if dates:
+        shard_first, shard_last = date_range_bounds(dates)
+        first, last = max(first, shard_first), min(last, shard_last)
+        if first > last:
+            return None
+    return {"dates": f"{first}/{last}", "sb": "date"}
+
+
+def advance_watermark(collection, raw_path, directory="data/raw"):
+    """
+    Store the newest record date in `raw_path` as the watermark. Call this only
+    once those records are loaded, so a failed transform or load is re-fetched
+    by the next incremental run. The stored watermark never moves backwards.
+    Returns the watermark now stored, or None.
+    """
+    newest = read_stored_watermark(collection, directory)
+    batch = []
+    for record in iter_raw_records(raw_path):
+        batch.append(record)
+        if len(batch) >= 10_000:
+            newest = latest_record_date(batch, newest)
+            batch = []
+    newest = latest_record_date(batch, newest)
+
+    if newest:
+        save_watermark(collection, newest, directory)
+    return newest
+
+
+def latest_record_date(results, current=None):
+    """
+    Newest YYYY-MM-DD `date` among a page of results, or `current` if later.
+    """
+    dates = [r.get("date") for r in results if isinstance(r.get("date"), str) and r.get("date")]
+    if current:
+        dates.append(current)
+    return max(dates) if dates else None
@@ -58,4 +58,300 @@ def test_clean_newspapers_csv(tmp_path, monkeypatch):
 
     assert len(df_clean) == 1       
     assert len(df_reject) == 1    
-    assert df_clean.iloc[0]["id"] == 1
\ No newline at end of file
+    assert df_clean.iloc[0]["id"] == 1
+
+
+HEADER = (
+    "id,title,item_lccn,item_date_issued,item_newspaper_title,"
+    "location_city,location_state,location_country,"
+    "description,language,subject,image_url,"
+    "item_medium,item_created_published,item_place_of_publication,item_language\n"
+)
+
+
+def csv_row(id, title="Hello", date="1910-01-01", city="Juneau"):
+    return f"{id},{title},sn123,{date},Daily News,{city},Alaska,United States,,en,news,,paper,1910,usa,en\n"
+
+
+def redirect_outputs(monkeypatch, directory):
+    monkeypatch.setattr("etl.clean_csv.OUTPUT_DIR", directory)
+    monkeypatch.setattr("etl.clean_csv.CLEANED_FILE", directory / "cleaned.csv")
+    monkeypatch.setattr("etl.clean_csv.REJECTED_FILE", directory / "rejected.csv")
+    monkeypatch.setattr("etl.clean_csv.STATE_FILE", directory / "state.csv")
+
+
+def test_clean_newspapers_parquet_round_trip(tmp_path, monkeypatch):
+    """
+    Parquet in, Parquet out: same cleaning result as the CSV path.
+    """
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        HEADER +
+        "a,Hello,sn123,1910-01-01,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "b,Bad Date,sn123,not-a-date,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+    )
+    input_parquet = tmp_path / "input.parquet"
+    pd.read_csv(input_csv).to_parquet(input_parquet)
+
+    redirect_outputs(monkeypatch, tmp_path)
+
+    cleaned_path = clean_newspapers_csv(input_path=str(input_parquet), output_format="parquet")
+
+    assert cleaned_path == tmp_path / "cleaned.parquet"
+    df_clean = pd.read_parquet(cleaned_path)
+    df_reject = pd.read_parquet(tmp_path / "rejected.parquet")
+
+    assert df_clean["id"].tolist() == ["a"]
+    assert df_clean.iloc[0]["description"] == "unknown"
+    assert df_clean.iloc[0]["title"] == "hello"
+    assert df_reject["id"].tolist() == ["b"]
+
+
+def test_normalize_dates_matches_is_valid_date():
+    from etl.clean_csv import normalize_dates, parse_date
+
+    values = ["1910-01-01", "January 5, 1911", "not-a-date", None, "", "  ", "January 5, 1911", "1910-01-01"]
+    series = pd.Series(values, index=range(10, 18))
+
+    parse_date.cache_clear()
+    normalized = normalize_dates(series)
+
+    # ISO dates never reach dateutil, and each distinct leftover is parsed once
+    assert parse_date.cache_info().misses == 2
+
+    assert normalized.tolist()[:3] == ["1910-01-01", "1911-01-05", None]
+    assert normalized.notna().tolist() == [is_valid_date(v) for v in values]
+    assert list(normalized.index) == list(series.index)
+
+
+def test_partial_dates_do_not_depend_on_run_date():
+    from etl.clean_csv import normalize_dates, parse_date
+
+    parse_date.cache_clear()
+    # "1894" and "1894-06" are caught by the dateutil fallback, not the ISO pass
+    series = pd.Series(["1894", "March 1900", "1894-06", "June 7, 1894"])
+
+    assert normalize_dates(series).tolist() == ["1894-01-01", "1900-03-01", "1894-06-01", "1894-06-07"]
+
+
+def test_clean_newspapers_adds_normalized_date(tmp_path, monkeypatch):
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        HEADER +
+        "a,Hello,sn123,1910-01-01,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "b,Hello,sn123,\"March 2, 1911\",Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "c,Hello,sn123,someday,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+    )
+    redirect_outputs(monkeypatch, tmp_path)
+
+    clean_newspapers_csv(input_path=str(input_csv))
+
+    df_clean = pd.read_csv(tmp_path / "cleaned.csv")
+    assert df_clean["item_date_normalized"].tolist() == ["1910-01-01", "1911-03-02"]
+    assert "item_date_normalized" not in pd.read_csv(tmp_path / "rejected.csv").columns
+
+
+def test_rejected_rows_carry_first_failing_reason(tmp_path, monkeypatch, capsys):
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        HEADER +
+        "a,Hello,sn123,1910-01-01,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "b,,sn123,not-a-date,Daily News,,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "c,Hello,sn123,not-a-date,Daily News,,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "d,Hello,sn123,1910-01-01,Daily News,Juneau,,United States,,en,news,,paper,1910,usa,en\n"
+        "e,Hello,,1910-01-01,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+    )
+    redirect_outputs(monkeypatch, tmp_path)
+
+    clean_newspapers_csv(input_path=str(input_csv))
+
+    df_reject = pd.read_csv(tmp_path / "rejected.csv")
+    assert df_reject["id"].tolist() == ["b", "c", "d", "e"]
+    assert df_reject["reject_reason"].tolist() == [
+        "missing_title", "invalid_date", "missing_location_state", "missing_item_lccn",
+    ]
+
+    out = capsys.readouterr().out
+    assert "Missing critical fields: 2" in out
+    assert "Invalid date formats:    1" in out
+    assert "Missing location fields: 1" in out
+
+
+def test_chunked_cleaning_matches_in_memory(tmp_path, monkeypatch):
+    rows = []
+    for i in range(40):
+        date = "not-a-date" if i % 7 == 0 else ('"March 2, 1911"' if i % 5 == 0 else "1910-01-01")
+        city = "" if i % 11 == 0 else "Juneau"
+        # ids repeat across chunk boundaries
+        rows.append(f"id{i % 25},Title {i},sn{i},{date},Daily News,{city},Alaska,United States,,en,News,,paper,1910,usa,en\n")
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(HEADER + "".join(rows))
+
+    outputs = {}
+    for mode, chunksize in (("memory", None), ("chunked", 6)):
+        out_dir = tmp_path / mode
+        redirect_outputs(monkeypatch, out_dir)
+        clean_newspapers_csv(input_path=str(input_csv), chunksize=chunksize)
+        outputs[mode] = out_dir
+
+    for name in ("cleaned.csv", "rejected.csv"):
+        assert (outputs["chunked"] / name).read_bytes() == (outputs["memory"] / name).read_bytes()
+    assert len(pd.read_csv(outputs["chunked"] / "cleaned.csv")) > 0
+
+
+def test_chunked_parquet_output_survives_all_blank_first_chunk(tmp_path, monkeypatch):
+    header = HEADER.rstrip("\n") + ",date,digitized\n"
+    # date and digitized are blank throughout the first chunk only
+    rows = [csv_row(f"id{i}").rstrip("\n") + ",,\n" for i in range(4)]
+    rows += [csv_row(f"id{i}").rstrip("\n") + ",1910-01-01,True\n" for i in range(4, 8)]
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(header + "".join(rows))
+
+    outputs = {}
+    for mode, chunksize in (("memory", None), ("chunked", 4)):
+        out_dir = tmp_path / mode
+        redirect_outputs(monkeypatch, out_dir)
+        outputs[mode] = pd.read_parquet(clean_newspapers_csv(input_path=str(input_csv), output_format="parquet",
+                                                             chunksize=chunksize))
+
+    chunked = outputs["chunked"]
+    assert chunked["date"].tolist() == [None] * 4 + ["1910-01-01"] * 4
+    assert chunked["digitized"].tolist() == [None] * 4 + [True] * 4
+    pd.testing.assert_frame_equal(chunked, outputs["memory"], check_dtype=False)
+
+
+def test_categorical_normalization_runs_per_category():
+    from etl.clean_csv import blank_mask, fill_categorical, lowercase_categorical
+
+    series = pd.Series(["Alaska", "alaska", "  ", None, "ALASKA", "Ohio"], dtype="category", index=range(5, 11))
+
+    mask = blank_mask(series)
+    assert mask.tolist() == [False, False, True, True, False, False]
+
+    filled = fill_categorical(series, mask, "unknown")
+    lowered = lowercase_categorical(filled)
+
+    assert lowered.tolist() == ["alaska", "alaska", "unknown", "unknown", "alaska", "ohio"]
+    assert sorted(lowered.cat.categories) == ["alaska", "ohio", "unknown"]
+    assert list(lowered.index) == list(series.index)
+
+
+def test_clean_loads_low_cardinality_columns_as_categoricals(tmp_path, monkeypatch):
+    from etl import clean_csv
+
+    seen = {}
+    original_clean_frame = clean_csv.clean_frame
+
+    def spy(df, stats, multi_valued=()):
+        seen.update(df.dtypes.astype(str).to_dict())
+        return original_clean_frame(df, stats, multi_valued)
+
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        HEADER +
+        "a,Hello,sn123,1910-01-01,Daily News,Juneau,Alaska,United States,,English,news,,paper,1910,usa,\n"
+    )
+    monkeypatch.setattr("etl.clean_csv.clean_frame", spy)
+    redirect_outputs(monkeypatch, tmp_path)
+
+    clean_newspapers_csv(input_path=str(input_csv))
+
+    assert seen["location_state"] == "category"
+    assert seen["title"] == "object"
+    # Nearly unique per row or per newspaper, so not worth categories
+    assert seen["item_lccn"] == seen["subject"] == seen["location_city"] == "object"
+
+    row = pd.read_csv(tmp_path / "cleaned.csv").iloc[0]
+    assert row["language"] == "english"
+    assert row["item_language"] == "[]"
+
+
+def test_incremental_clean_only_reprocesses_changed_rows(tmp_path, monkeypatch):
+    from etl import clean_csv
+
+    input_csv = tmp_path / "input.csv"
+    redirect_outputs(monkeypatch, tmp_path)
+
+    cleaned_ids = []
+    original_clean_frame = clean_csv.clean_frame
+
+    def spy(df, stats, multi_valued=()):
+        cleaned_ids.append(df["id"].tolist())
+        return original_clean_frame(df, stats, multi_valued)
+
+    monkeypatch.setattr("etl.clean_csv.clean_frame", spy)
+
+    input_csv.write_text(HEADER + csv_row("a") + csv_row("b", date="bad")
+                         + csv_row("c") + csv_row("d"))
+    clean_newspapers_csv(input_path=str(input_csv), incremental=True)
+
+    # b is fixed, c changes, d disappears, e is new
+    input_csv.write_text(HEADER + csv_row("a") + csv_row("b")
+                         + csv_row("c", title="Changed") + csv_row("e", city=""))
+    clean_newspapers_csv(input_path=str(input_csv), incremental=True)
+
+    assert cleaned_ids == [["a", "b", "c", "d"], ["b", "c", "e"]]
+
+    incremental = {name: (tmp_path / f"{name}.csv").read_bytes() for name in ("cleaned", "rejected")}
+
+    # A full clean of the same input gives the same outputs
+    monkeypatch.setattr("etl.clean_csv.CLEANED_FILE", tmp_path / "full_cleaned.csv")
+    monkeypatch.setattr("etl.clean_csv.REJECTED_FILE", tmp_path / "full_rejected.csv")
+    clean_newspapers_csv(input_path=str(input_csv))
+
+    assert incremental["cleaned"] == (tmp_path / "full_cleaned.csv").read_bytes()
+    assert incremental["rejected"] == (tmp_path / "full_rejected.csv").read_bytes()
+    assert pd.read_csv(tmp_path / "cleaned.csv")["title"].tolist() == ["hello", "hello", "changed"]
+
+
+def test_incremental_clean_reruns_everything_on_rules_version_change(tmp_path, monkeypatch):
+    from etl import clean_csv
+
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(HEADER + csv_row("a") + csv_row("b"))
+    redirect_outputs(monkeypatch, tmp_path)
+
+    clean_newspapers_csv(input_path=str(input_csv), incremental=True)
+
+    cleaned_counts = []
+    original_clean_frame = clean_csv.clean_frame
+
+    def spy(df, stats, multi_valued=()):
+        cleaned_counts.append(len(df))
+        return original_clean_frame(df, stats, multi_valued)
+
+    monkeypatch.setattr("etl.clean_csv.clean_frame", spy)
+
+    clean_newspapers_csv(input_path=str(input_csv), incremental=True)
+    monkeypatch.setattr("etl.clean_csv.RULES_VERSION", clean_csv.RULES_VERSION + 1)
+    clean_newspapers_csv(input_path=str(input_csv), incremental=True)
+
+    assert cleaned_counts == [0, 2]
+    assert pd.read_csv(tmp_path / "state.csv")["rules_version"].tolist() == [clean_csv.RULES_VERSION] * 2
+
+
+def test_parallel_cleaning_matches_serial(tmp_path, monkeypatch, capsys):
+    rows = []
+    for i in range(60):
+        date = "not-a-date" if i % 7 == 0 else ('"March 2, 1911"' if i % 5 == 0 else "1910-01-01")
+        city = "" if i % 11 == 0 else ("JUNEAU" if i % 2 else "Juneau")
+        title = "" if i % 13 == 0 else f"Title {i}"
+        rows.append(f"id{i % 45},{title},sn{i},{date},Daily News,{city},Alaska,United States,,en,News,,paper,1910,usa,en\n")
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(HEADER + "".join(rows))
+
+    outputs = {}
+    summaries = {}
+    for mode, workers in (("serial", None), ("parallel", 3)):
+        out_dir = tmp_path / mode
+        redirect_outputs(monkeypatch, out_dir)
+        capsys.readouterr()
+        clean_newspapers_csv(input_path=str(input_csv), workers=workers)
+        summary = capsys.readouterr().out.split("--- CLEANING SUMMARY ---")[1]
+        summaries[mode] = summary.split("Cleaned CSV saved to")[0]
+        outputs[mode] = out_dir
+
+    for name in ("cleaned.csv", "rejected.csv"):
+        assert (outputs["parallel"] / name).read_bytes() == (outputs["serial"] / name).read_bytes()
+    assert summaries["parallel"] == summaries["serial"]
+    assert "Duplicates removed:  15" in summaries["serial"]
@@ -47,3 +47,115 @@ def test_create_tables():
 
     cur.close()
     conn.close()
+
+
+def test_migrate_applies_only_pending_versions():
+    from unittest.mock import MagicMock, patch
+    from etl.create_tables import LATEST_VERSION, MIGRATIONS
+
+    def run(recorded_version, rebuild=False):
+        conn = MagicMock()
+        cur = conn.cursor.return_value
+        cur.fetchone.return_value = (recorded_version,)
+        with patch("etl.create_tables.connect", return_value=conn):
+            applied = create_tables(rebuild=rebuild)
+        executed = [c.args[0] for c in cur.execute.call_args_list]
+        return applied, executed
+
+    applied, executed = run(0)
+    assert applied == [version for version, _, _ in MIGRATIONS]
+    assert not any("DROP TABLE" in sql for sql in executed)
+    assert sum("INSERT INTO schema_version" in sql for sql in executed) == len(MIGRATIONS)
+
+    # Up-to-date schema: nothing but the version check runs
+    applied, executed = run(LATEST_VERSION)
+    assert applied == []
+    assert not any("CREATE TABLE IF NOT EXISTS newspapers" in sql for sql in executed)
+
+    # Rebuild is opt-in and drops before migrating
+    _, executed = run(0, rebuild=True)
+    assert executed.index("DROP TABLE IF EXISTS newspapers CASCADE;") < next(
+        i for i, sql in enumerate(executed) if "CREATE TABLE IF NOT EXISTS newspapers" in sql)
+
+
+def test_create_tables_keeps_existing_rows():
+    """
+    Re-running create_tables() migrates in place instead of dropping data.
+    """
+    create_tables(rebuild=True)
+
+    conn = connect()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO newspapers (lccn, title) VALUES ('sn0', 'kept');")
+    conn.commit()
+
+    assert create_tables() == []
+
+    cur.execute("SELECT title FROM newspapers WHERE lccn='sn0';")
+    assert cur.fetchone() == ("kept",)
+    cur.execute("SELECT MAX(version) FROM schema_version;")
+    assert cur.fetchone()[0] >= 1
+
+    cur.close()
+    conn.close()
+
+
+def test_seq_scanned_tables_walks_nested_plans():
+    from etl.create_tables import seq_scanned_tables
+
+    plan = {
+        "Node Type": "Hash Join",
+        "Plans": [
+            {"Node Type": "Index Scan", "Relation Name": "issues", "Index Name": "issues_location_id_idx"},
+            {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "locations"}]},
+        ],
+    }
+
+    assert seq_scanned_tables(plan) == ["locations"]
+    assert seq_scanned_tables(plan["Plans"][0]) == []
+
+
+def test_hot_queries_use_indexes():
+    """
+    Every per-row loader statement in HOT_QUERIES is served by an index,
+    and the chart queries plan against the migrated schema.
+    """
+    from etl.create_tables import CHART_QUERIES, HOT_QUERIES, check_hot_query_indexes
+
+    create_tables()
+
+    assert check_hot_query_indexes() == {name: [] for name in HOT_QUERIES}
+    assert set(check_hot_query_indexes(CHART_QUERIES)) == set(CHART_QUERIES)
+
+
+def test_locations_are_unique_by_natural_key():
+    create_tables(rebuild=True)
+
+    conn = connect()
+    cur = conn.cursor()
+    for _ in range(2):
+        cur.execute("""
+            INSERT INTO locations (city, state, country) VALUES ('juneau', 'alaska', 'united states')
+            ON CONFLICT (city, state, country) DO NOTHING;
+        """)
+    conn.commit()
+
+    cur.execute("SELECT COUNT(*) FROM locations;")
+    assert cur.fetchone()[0] == 1
+
+    cur.close()
+    conn.close()
+
+
+def test_hot_queries_are_the_statements_the_pipeline_runs():
+    import inspect
+    from etl import input_data_into_db, make_charts, queries
+    from etl.create_tables import CHART_QUERIES, HOT_QUERIES
+
+    checked = {sql for sql, _ in HOT_QUERIES.values()} | {sql for sql, _ in CHART_QUERIES.values()}
+    statements = {value for name, value in vars(queries).items() if name.endswith("_SQL")}
+    assert checked == statements
+
+    # Every shared statement is executed by the loader or a chart
+    used = inspect.getsource(input_data_into_db) + inspect.getsource(make_charts)
+    assert all(name in used for name in vars(queries) if name.endswith("_SQL"))
@@ -52,3 +52,158 @@ def test_filename_correct(tmp_path):
     output_path = fetch_from_api(collection="abc123", max_pages=0)
 
     assert output_path.endswith("abc123_raw.json")
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """
+    Stand-in for LocClient serving `total_pages` pages of one record each.
+    """
+    def __init__(self, total_pages):
+        self.total_pages = total_pages
+        self.requested = []
+
+    def get(self, url):
+        self.requested.append(url)
+        page = int(url.split("sp=")[1]) if "sp=" in url else 1
+        next_url = f"https://www.loc.gov/test/?fo=json&sp={page + 1}" if page < self.total_pages else None
+        return FakeResponse({
+            "results": [{"id": f"record-{page}"}],
+            "pagination": {"current": page, "next": next_url, "total": self.total_pages},
+        })
+
+
+def test_concurrent_fetch_matches_serial_order(tmp_path, monkeypatch):
+    """
+    The concurrent path should write the same records, in page order, as the serial path.
+    """
+    import etl.fetch_from_api as mod
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+    client = FakeClient(total_pages=6)
+
+    with open(fetch_from_api(collection="serial", max_pages=5, client=client)) as f:
+        serial = json.load(f)
+    with open(fetch_from_api(collection="parallel", max_pages=5, concurrency=3, client=client)) as f:
+        parallel = json.load(f)
+
+    assert [r["id"] for r in serial] == [f"record-{p}" for p in range(1, 6)]
+    assert parallel == serial
+
+
+def test_ndjson_output_streams_compact_records(tmp_path, monkeypatch):
+    """
+    NDJSON mode should write one compact record per line, gzip-compressed when asked.
+    """
+    import gzip
+    import etl.fetch_from_api as mod
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+
+    output_path = fetch_from_api(
+        collection="stream", max_pages=3, client=FakeClient(total_pages=3),
+        output_format="ndjson", compression="gzip",
+    )
+
+    assert output_path.endswith("stream_raw.ndjson.gz")
+    with gzip.open(output_path, "rt") as f:
+        lines = f.read().splitlines()
+
+    assert lines == ['{"id":"record-1"}', '{"id":"record-2"}', '{"id":"record-3"}']
+
+
+class FlakyClient(FakeClient):
+    """
+    FakeClient that fails every request for one page.
+    """
+    def __init__(self, total_pages, fail_page):
+        super().__init__(total_pages)
+        self.fail_page = fail_page
+
+    def get(self, url):
+        page = int(url.split("sp=")[1]) if "sp=" in url else 1
+        if page == self.fail_page:
+            self.requested.append(url)
+            return FakeResponse({}, status_code=500)
+        return super().get(url)
+
+
+def requested_pages(client):
+    return sorted(int(url.split("sp=")[1]) if "sp=" in url else 1 for url in client.requested)
+
+
+def test_checkpointed_crawl_resumes_without_refetching(tmp_path, monkeypatch):
+    import pytest
+    import etl.fetch_from_api as mod
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+
+    with pytest.raises(Exception):
+        fetch_from_api(collection="resume", max_pages=5, checkpoint=True,
+                       client=FlakyClient(total_pages=5, fail_page=3))
+
+    assert (tmp_path / "resume_pages" / "page_00002.ndjson").exists()
+
+    client = FakeClient(total_pages=5)
+    with open(fetch_from_api(collection="resume", max_pages=5, checkpoint=True, client=client)) as f:
+        data = json.load(f)
+
+    assert requested_pages(client) == [3, 4, 5]
+    assert [r["id"] for r in data] == [f"record-{p}" for p in range(1, 6)]
+
+
+def test_concurrent_checkpointed_crawl_skips_finished_pages(tmp_path, monkeypatch):
+    import pytest
+    import etl.fetch_from_api as mod
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+
+    with pytest.raises(Exception):
+        fetch_from_api(collection="resume", max_pages=6, concurrency=3, checkpoint=True,
+                       client=FlakyClient(total_pages=6, fail_page=4))
+
+    saved = {int(p.stem.split("_")[1]) for p in (tmp_path / "resume_pages").glob("page_*.ndjson")}
+    assert {1, 2, 3} <= saved and 4 not in saved
+
+    client = FakeClient(total_pages=6)
+    with open(fetch_from_api(collection="resume", max_pages=6, concurrency=3, checkpoint=True,
+                             client=client)) as f:
+        data = json.load(f)
+
+    assert requested_pages(client) == [p for p in range(1, 7) if p not in saved]
+    assert [r["id"] for r in data] == [f"record-{p}" for p in range(1, 7)]
+
+
+def test_checkpointed_rerun_after_completed_crawl_fetches_fresh_pages(tmp_path, monkeypatch):
+    import etl.fetch_from_api as mod
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+
+    for concurrency in (1, 3):
+        fetch_from_api(collection="rerun", max_pages=5, concurrency=concurrency, checkpoint=True,
+                       client=FakeClient(total_pages=3))
+        assert not (tmp_path / "rerun_pages").exists()
+
+        client = FakeClient(total_pages=5)
+        with open(fetch_from_api(collection="rerun", max_pages=5, concurrency=concurrency, checkpoint=True,
+                                 client=client)) as f:
+            data = json.load(f)
+
+        assert requested_pages(client) == [1, 2, 3, 4, 5]
+        assert [r["id"] for r in data] == [f"record-{p}" for p in range(1, 6)]
+
+
+def test_concurrent_fetch_stops_soon_after_a_failed_page(tmp_path, monkeypatch):
+    import pytest
+    import etl.fetch_from_api as mod
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+
+    client = FlakyClient(total_pages=200, fail_page=3)
+    with pytest.raises(Exception):
+        fetch_from_api(collection="flaky", max_pages=200, concurrency=3, client=client)
+
+    # Only the pages already in the window when page 3 failed were requested
+    assert len(client.requested) <= 1 + 3 + 3
@@ -43,3 +43,48 @@ def test_input_into_db_runs_insertions():
             mock_conn.commit.assert_called()
             mock_cursor.close.assert_called()
             mock_conn.close.assert_called()
+
+
+def test_issue_value_pairs_from_json_text_and_lists():
+    import numpy as np
+    from etl.input_data_into_db import issue_value_pairs
+
+    # CSV cells are JSON arrays, so commas inside a value don't split it
+    csv_df = pd.DataFrame({"id": ["a", "b", "c"],
+                           "subject": ['["oakwood (montgomery county, ohio)", "news"]', "unknown", None]})
+    pairs = issue_value_pairs(csv_df, "subject")
+    assert list(pairs.itertuples(index=False, name=None)) == [
+        ("a", "oakwood (montgomery county, ohio)"), ("a", "news"), ("b", "unknown"),
+    ]
+
+    # Parquet list cells keep values that contain commas intact
+    parquet_df = pd.DataFrame({"id": ["a", "b"], "subject": [np.array(["juneau, alaska", "news"]), np.array(["news"])]})
+    pairs = issue_value_pairs(parquet_df, "subject")
+    assert list(pairs.itertuples(index=False, name=None)) == [("a", "juneau, alaska"), ("a", "news"), ("b", "news")]
+
+
+def test_input_into_db_upserts_into_existing_tables():
+    mock_df = pd.DataFrame({
+        "item_lccn": ["sn123"], "item_newspaper_title": ["Daily News"],
+        "location_city": ["Juneau"], "location_state": ["Alaska"], "location_country": ["United States"],
+        "id": ["abc123"], "item_date_issued": ["1910-01-01"], "title": ["Sample Title"],
+        "item_medium": ["paper"], "image_url": ["http://example.com"], "url": ["http://example.com"],
+        "item_language": ["en"], "subject": ["news"]
+    })
+
+    with patch("pandas.read_csv", return_value=mock_df):
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.fetchone.return_value = (7,)
+
+        with patch("etl.input_data_into_db.connect", return_value=mock_conn):
+            input_into_db()
+
+    executed = [c.args for c in mock_cursor.execute.call_args_list]
+    issue_insert = next(sql for sql, *_ in executed if "INSERT INTO issues" in sql)
+    assert "DO UPDATE SET" in issue_insert and "RETURNING issue_id" in issue_insert
+
+    # Reloaded issues have their junction rows replaced, not duplicated
+    deletes = [args for args in executed if args[0].startswith("DELETE FROM issue_")]
+    assert [params for _, params in deletes] == [([7],), ([7],)]
+    assert not any("DROP TABLE" in sql for sql, *_ in executed)
@@ -0,0 +1,55 @@
+import requests
+from unittest.mock import MagicMock, patch
+
+from etl.loc_client import LocClient, retry_after_seconds
+
+
+def make_response(status_code, headers=None, payload=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    resp.json.return_value = payload or {}
+    return resp
+
+
+def test_session_negotiates_compression_and_keep_alive():
+    client = LocClient()
+    assert "gzip" in client.session.headers["Accept-Encoding"]
+    assert client.session.headers["Connection"] == "keep-alive"
+    client.close()
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(make_response(429, {"Retry-After": "3"})) == 3.0
+    assert retry_after_seconds(make_response(429)) is None
+    assert retry_after_seconds(make_response(429, {"Retry-After": "soon"})) is None
+
+
+def test_get_retries_throttled_and_server_errors():
+    client = LocClient(max_retries=3, backoff=0)
+    responses = [
+        make_response(429, {"Retry-After": "0"}),
+        make_response(503),
+        make_response(200, payload={"results": [1]}),
+    ]
+
+    with patch.object(client.session, "get", side_effect=responses) as mock_get, \
+            patch("etl.loc_client.time.sleep"):
+        data = client.get_json("https://www.loc.gov/newspapers/?fo=json")
+
+    assert data == {"results": [1]}
+    assert mock_get.call_count == 3
+
+
+def test_get_gives_up_after_max_retries():
+    client = LocClient(max_retries=2, backoff=0)
+
+    with patch.object(client.session, "get", side_effect=requests.ConnectionError("down")) as mock_get, \
+            patch("etl.loc_client.time.sleep"):
+        try:
+            client.get("https://www.loc.gov/newspapers/?fo=json")
+            assert False, "Expected ConnectionError"
+        except requests.ConnectionError:
+            pass
+
+    assert mock_get.call_count == 3
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from etl.loc_client import LocClient
+from etl.loc_stub_server import LocStubServer, load_seed_records
+
+RECORDS = [{"id": f"record-{i}", "title": f"Title {i}"} for i in range(1, 24)]
+
+
+@pytest.fixture
+def fetch_module(tmp_path, monkeypatch):
+    import etl.fetch_from_api as mod
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+    return mod
+
+
+def test_load_seed_records_repeats_with_unique_ids():
+    seed = load_seed_records()
+    records = load_seed_records(repeat=3)
+
+    assert len(records) == 3 * len(seed)
+    assert len({r["id"] for r in records}) == len(records)
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_fetch_pages_through_stub_server(fetch_module, monkeypatch, concurrency):
+    with LocStubServer(RECORDS, perpage=5) as server:
+        monkeypatch.setattr(fetch_module, "LOC_BASE_URL", server.base_url)
+        output_path = fetch_module.fetch_from_api(
+            collection="newspapers", max_pages=10, delay=0, concurrency=concurrency,
+        )
+
+    with open(output_path) as f:
+        data = json.load(f)
+
+    assert [r["id"] for r in data] == [r["id"] for r in RECORDS]
+    assert server.stats["ok"] == 5
+
+
+def test_client_retries_injected_errors(fetch_module, monkeypatch):
+    with LocStubServer(RECORDS, perpage=5, error_rate=0.3, throttle_rate=0.2, seed=7) as server:
+        monkeypatch.setattr(fetch_module, "LOC_BASE_URL", server.base_url)
+        client = LocClient(max_retries=10, backoff=0)
+        output_path = fetch_module.fetch_from_api(collection="newspapers", max_pages=10, client=client)
+
+    with open(output_path) as f:
+        assert len(json.load(f)) == len(RECORDS)
+
+    assert server.stats["errors"] + server.stats["throttled"] > 0
+
+
+def test_stub_server_answers_conditional_requests(fetch_module, monkeypatch, tmp_path):
+    from etl.response_cache import ResponseCache
+
+    with LocStubServer(RECORDS, perpage=5) as server:
+        monkeypatch.setattr(fetch_module, "LOC_BASE_URL", server.base_url)
+        for _ in range(2):
+            client = LocClient(cache=ResponseCache(tmp_path / ".cache"))
+            fetch_module.fetch_from_api(collection="newspapers", max_pages=10, client=client)
+
+    assert server.stats["not_modified"] == 5
+    assert client.cache.stats["revalidated"] == 5
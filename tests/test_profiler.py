@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from etl.profiler import CountMinSketch, DataProfile, HyperLogLog, bit_length, hash_values
+
+
+def test_bit_length_matches_python():
+    values = [0, 1, 2, 3, 255, 256, 2**32 - 1, 2**32, 2**53 - 1, 2**63 + 12345, 2**64 - 1]
+
+    assert bit_length(np.array(values, dtype=np.uint64)).tolist() == [v.bit_length() for v in values]
+
+
+def test_hyperloglog_estimates_distinct_counts():
+    for distinct in (10, 1_000, 200_000):
+        hll = HyperLogLog()
+        ids = pd.Series(np.arange(distinct).astype(str))
+        # Repeats must not move the estimate
+        hll.add_hashes(hash_values(ids))
+        hll.add_hashes(hash_values(ids.iloc[: distinct // 2]))
+
+        assert abs(hll.estimate() - distinct) <= max(1, 0.03 * distinct)
+
+
+def test_count_min_never_undercounts():
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.zipf(1.5, size=50_000) % 5_000).astype(str)
+    counts = values.value_counts()
+
+    cms = CountMinSketch(width=512, depth=4)
+    hashes = hash_values(pd.Series(counts.index))
+    cms.add_hashes(hashes, counts.to_numpy())
+    estimates = cms.estimate_hashes(hashes)
+
+    assert (estimates >= counts.to_numpy()).all()
+    assert ((estimates - counts.to_numpy()) <= np.e / 512 * len(values)).mean() > 0.95
+
+
+def test_profile_streamed_in_chunks_matches_exact_stats(tmp_path):
+    rng = np.random.default_rng(1)
+    states = np.array(["virginia", "ohio", "alaska", "new york", "district of columbia"])
+    df = pd.DataFrame({
+        "id": [f"id-{i}" for i in range(20_000)],
+        "location_state": states[rng.choice(len(states), size=20_000, p=[0.5, 0.2, 0.15, 0.1, 0.05])],
+        "description": rng.choice(["", None, "a short note", "x" * 300], size=20_000),
+    })
+
+    profile = DataProfile(top_k=3)
+    for start in range(0, len(df), 1_500):
+        profile.update(df.iloc[start:start + 1_500])
+    path = profile.write(tmp_path / "profile.json")
+    result = json.loads(path.read_text())
+
+    assert result["rows"] == 20_000
+    columns = result["columns"]
+    assert abs(columns["id"]["distinct_estimate"] - 20_000) <= 600
+    assert columns["location_state"]["distinct_estimate"] == 5
+
+    exact = df["location_state"].value_counts()
+    assert [v["value"] for v in columns["location_state"]["top_values"]] == exact.index[:3].tolist()
+    assert [v["count_estimate"] for v in columns["location_state"]["top_values"]] == exact.iloc[:3].tolist()
+
+    blank = df["description"].isna() | (df["description"] == "")
+    description = columns["description"]
+    assert description["null_count"] == blank.sum()
+    assert description["null_rate"] == round(blank.mean(), 6)
+    assert description["length"]["min"] == 12
+    assert description["length"]["max"] == 300
+    assert description["length"]["histogram"]["8-15"] + description["length"]["histogram"]["256-511"] == (~blank).sum()
+
+
+def test_clean_writes_profile_next_to_cleaned_output(tmp_path, monkeypatch):
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        "id,title,item_lccn,item_date_issued,item_newspaper_title,"
+        "location_city,location_state,location_country,"
+        "description,language,subject,image_url,"
+        "item_medium,item_created_published,item_place_of_publication,item_language\n"
+        "a,Hello,sn123,1910-01-01,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "b,Hello,sn123,1910-01-01,Daily News,Sitka,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "c,Hello,sn123,bad,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+        "a,Hello,sn123,1910-01-01,Daily News,Juneau,Alaska,United States,,en,news,,paper,1910,usa,en\n"
+    )
+    monkeypatch.setattr("etl.clean_csv.CLEANED_FILE", tmp_path / "cleaned.csv")
+    monkeypatch.setattr("etl.clean_csv.REJECTED_FILE", tmp_path / "rejected.csv")
+    monkeypatch.setattr("etl.clean_csv.OUTPUT_DIR", tmp_path)
+
+    from etl.clean_csv import clean_newspapers_csv
+    clean_newspapers_csv(input_path=str(input_csv))
+
+    profile = json.loads((tmp_path / "cleaned_profile.json").read_text())
+    assert profile["rows"] == 2
+    assert profile["columns"]["location_city"]["distinct_estimate"] == 2
+    assert profile["columns"]["description"]["top_values"] == [{"value": "unknown", "count_estimate": 2}]
+
+    (tmp_path / "cleaned_profile.json").unlink()
+    clean_newspapers_csv(input_path=str(input_csv), profile=False)
+    assert not (tmp_path / "cleaned_profile.json").exists()
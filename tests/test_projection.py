@@ -0,0 +1,42 @@
+import json
+import os
+
+from etl.projection import CSV_PROJECTION, project_record, project_records
+
+
+def test_project_record_keeps_only_spec_keys():
+    record = {
+        "id": "1",
+        "title": "T",
+        "batch": ["big"],
+        "resources": [{"files": []}],
+        "item": {"medium": "4 pages", "notes": ["long"], "date_issued": "1900-01-01"},
+    }
+
+    projected = project_record(record, CSV_PROJECTION)
+
+    assert projected == {"id": "1", "title": "T", "item": {"medium": "4 pages", "date_issued": "1900-01-01"}}
+
+
+def test_project_records_without_spec_is_identity():
+    records = [{"id": "1", "extra": True}]
+    assert project_records(records, None) is records
+
+
+def test_projected_fetch_asks_for_less_and_stores_less(tmp_path, monkeypatch):
+    import etl.fetch_from_api as mod
+    from etl.loc_stub_server import LocStubServer, load_seed_records
+
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+
+    with LocStubServer(load_seed_records(), perpage=40) as server:
+        monkeypatch.setattr(mod, "LOC_BASE_URL", server.base_url)
+        full = mod.fetch_from_api(collection="full", max_pages=2, delay=0)
+        slim = mod.fetch_from_api(collection="slim", max_pages=2, delay=0, projection=CSV_PROJECTION)
+
+    with open(slim) as f:
+        records = json.load(f)
+
+    assert len(records) == 80
+    assert set(records[0]) <= set(CSV_PROJECTION)
+    assert os.path.getsize(slim) < os.path.getsize(full) / 3
@@ -0,0 +1,83 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from etl.loc_client import LocClient
+from etl.rate_limiter import TokenBucket
+
+
+def test_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_shared_bucket_caps_concurrent_callers():
+    bucket = TokenBucket(rate=50)
+    start = time.monotonic()
+
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # First token is free, the other 10 refill at 50/s
+    assert time.monotonic() - start >= 10 / 50 * 0.9
+
+
+def test_throttle_halves_rate_and_success_recovers():
+    bucket = TokenBucket(rate=8, recovery=0.5)
+
+    bucket.throttled(retry_after=0)
+    assert bucket.rate == 4
+
+    bucket.succeeded()
+    bucket.succeeded()
+    assert bucket.rate == 8
+
+
+def test_retry_after_blocks_all_callers():
+    bucket = TokenBucket(rate=1000)
+    bucket.throttled(retry_after=0.2)
+
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_client_reports_429_to_limiter():
+    limiter = MagicMock()
+    client = LocClient(backoff=0, rate_limiter=limiter)
+
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "2"})
+    ok = MagicMock(status_code=200, headers={})
+
+    with patch.object(client.session, "get", side_effect=[throttled, ok]), \
+            patch("etl.loc_client.time.sleep") as mock_sleep:
+        assert client.get("https://www.loc.gov/newspapers/?fo=json") is ok
+
+    limiter.throttled.assert_called_once_with(2.0)
+    limiter.succeeded.assert_called_once()
+    assert limiter.acquire.call_count == 2
+    mock_sleep.assert_called_once_with(0)
+
+
+def test_fetch_rate_is_shared_by_all_workers():
+    import etl.fetch_from_api as mod
+
+    limiters = []
+
+    def fake_client(pool_size, cache, rate_limiter):
+        limiters.append(rate_limiter)
+        client = MagicMock()
+        client.get.side_effect = ConnectionError("offline")
+        return client
+
+    with patch("etl.fetch_from_api.LocClient", side_effect=fake_client):
+        for kwargs in ({"delay": 1}, {"delay": 1, "rate": 4}, {"delay": 0}):
+            with pytest.raises(ConnectionError):
+                list(mod.fetch_pages(None, "newspapers", max_pages=1, concurrency=4, **kwargs))
+
+    assert [limiter.max_rate if limiter else None for limiter in limiters] == [1.0, 4.0, None]
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from etl.raw_io import iter_raw_records, open_raw, raw_filename, split_raw_path, write_ndjson_records
+
+
+def test_raw_filename_and_split_round_trip():
+    name = raw_filename("newspapers", "ndjson", "gzip")
+    assert name == "newspapers_raw.ndjson.gz"
+    assert split_raw_path(f"data/raw/{name}") == ("newspapers", "ndjson", "gzip")
+    assert split_raw_path("data/raw/newspapers_raw.json") == ("newspapers", "json", None)
+
+
+def test_raw_filename_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        raw_filename("newspapers", "xml")
+
+
+def test_iter_raw_records_reads_both_formats(tmp_path):
+    records = [{"id": "1"}, {"id": "2"}]
+
+    json_path = tmp_path / "a_raw.json"
+    json_path.write_text(json.dumps(records))
+
+    ndjson_path = tmp_path / "a_raw.ndjson.gz"
+    with open_raw(ndjson_path, "w") as f:
+        write_ndjson_records(f, records)
+
+    assert list(iter_raw_records(json_path)) == records
+    assert list(iter_raw_records(ndjson_path)) == records
+
+
+def test_iter_raw_records_rejects_non_list_json(tmp_path):
+    path = tmp_path / "bad_raw.json"
+    path.write_text('{"id": "1"}')
+
+    with pytest.raises(ValueError):
+        list(iter_raw_records(path))
+
+
+def test_iter_json_array_handles_elements_split_across_chunks():
+    import io
+    from etl.raw_io import iter_json_array
+
+    records = [{"id": str(i), "text": "x" * (i * 7)} for i in range(50)] + [12345, "tail"]
+    text = json.dumps(records, indent=4)
+
+    assert list(iter_json_array(io.StringIO(text), chunk_size=16)) == records
+    assert list(iter_json_array(io.StringIO("  [ ]  "), chunk_size=2)) == []
+
+
+def test_iter_json_array_every_chunk_size():
+    import io
+    from etl.raw_io import iter_json_array
+
+    records = [1.5, -20, 3e-7, 12345, True, None, "a, \"quoted\" string", "",
+               {"id": "x", "nested": {"n": [1.25, {"deep": False}], "s": "}]"}}, [], [[0.5]]]
+    for text in (json.dumps(records), json.dumps(records, indent=2), "[1.5]", "[ 1e10 ,2]"):
+        expected = json.loads(text)
+        for chunk_size in range(1, len(text) + 1):
+            assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == expected, chunk_size
+
+
+def test_iter_json_array_rejects_truncated_input():
+    import io
+    from etl.raw_io import iter_json_array
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"id": 1}, {"id": '), chunk_size=4))
@@ -0,0 +1,64 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from etl.loc_client import LocClient
+from etl.response_cache import ResponseCache
+
+URL = "https://www.loc.gov/newspapers/?fo=json"
+
+
+def make_response(status_code, body=b"", headers=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.content = body
+    resp.headers = headers or {}
+    resp.json.side_effect = lambda: json.loads(body)
+    return resp
+
+
+def test_conditional_revalidation_serves_cached_body(tmp_path):
+    cache = ResponseCache(tmp_path / ".cache")
+    client = LocClient(cache=cache)
+
+    responses = [
+        make_response(200, b'{"results": [1]}', {"ETag": '"v1"'}),
+        make_response(304),
+    ]
+    with patch.object(client.session, "get", side_effect=responses) as mock_get:
+        first = client.get_json(URL)
+        second = client.get_json(URL)
+
+    assert first == second == {"results": [1]}
+    assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert cache.stats == {"hits": 0, "revalidated": 1, "misses": 1}
+
+
+def test_fresh_entries_skip_the_network(tmp_path):
+    cache = ResponseCache(tmp_path / ".cache", max_age=3600)
+    client = LocClient(cache=cache)
+
+    with patch.object(client.session, "get", return_value=make_response(200, b'{"a": 1}')) as mock_get:
+        client.get_json(URL)
+        assert client.get_json(URL) == {"a": 1}
+
+    assert mock_get.call_count == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    cache = ResponseCache(tmp_path / ".cache")
+    cache.store(URL, make_response(200, b"same"))
+    cache.store(URL + "&sp=2", make_response(200, b"same"))
+
+    assert len(list((tmp_path / ".cache" / "objects").iterdir())) == 1
+    assert cache.size == 4
+
+
+def test_eviction_keeps_cache_under_budget(tmp_path):
+    cache = ResponseCache(tmp_path / ".cache", max_bytes=10)
+
+    cache.store(URL + "&sp=1", make_response(200, b"123456"))
+    cache.store(URL + "&sp=2", make_response(200, b"abcdef"))
+
+    assert cache.size <= 10
+    assert cache.lookup(URL + "&sp=2") is not None
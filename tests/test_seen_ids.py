@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from etl.seen_ids import SeenIds
+
+
+def test_first_seen_dedupes_within_and_across_batches():
+    seen = SeenIds()
+
+    first = seen.first_seen(pd.Series(["a", "b", "a", None]))
+    second = seen.first_seen(pd.Series(["b", "c", None, "c"]))
+
+    assert first.tolist() == [True, True, False, True]
+    assert second.tolist() == [False, True, False, False]
+    assert len(seen) == 4
+
+
+def test_runs_stay_logarithmic_and_match_drop_duplicates():
+    rng = np.random.default_rng(0)
+    ids = pd.Series(rng.integers(0, 20_000, size=50_000).astype(str))
+
+    seen = SeenIds()
+    kept = np.concatenate([seen.first_seen(ids.iloc[i:i + 1000]) for i in range(0, len(ids), 1000)])
+
+    assert kept.tolist() == (~ids.duplicated()).tolist()
+    assert len(seen) == ids.nunique()
+    assert len(seen.runs) <= 2 * int(np.log2(len(ids) // 1000)) + 1
+
+
+def test_missing_ids_never_match_the_string_nan():
+    seen = SeenIds()
+
+    first = seen.first_seen(pd.Series([np.nan, "nan", np.nan]))
+    second = seen.first_seen(pd.Series(["nan", np.nan]))
+
+    assert first.tolist() == [True, True, False]
+    assert second.tolist() == [False, False]
+    assert len(seen) == 2
+
+
+def test_key_hash_collision_keeps_both_ids_and_is_counted(monkeypatch):
+    import etl.seen_ids as seen_ids
+
+    real_hash = seen_ids.hash_ids
+
+    def colliding_key_hash(ids, hash_key=None):
+        if hash_key:
+            return real_hash(ids, hash_key)
+        return np.zeros(len(ids), dtype=np.uint64)
+
+    monkeypatch.setattr(seen_ids, "hash_ids", colliding_key_hash)
+    seen = SeenIds()
+
+    first = seen.first_seen(pd.Series(["a", "b", "a"]))
+    second = seen.first_seen(pd.Series(["c", "b", "a", "c"]))
+
+    assert first.tolist() == [True, True, False]
+    assert second.tolist() == [True, False, False, False]
+    assert seen.collisions == 2
+    assert len(seen) == 3
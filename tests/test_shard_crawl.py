@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from etl.raw_io import iter_raw_records, open_raw, raw_filename, write_ndjson_records
+from etl.shard_crawl import merge_manifests, plan_date_shards, plan_facet_shards, run_sharded_crawl
+
+
+def test_plan_date_shards_covers_range_without_gaps():
+    shards = plan_date_shards(1900, 1909, 3)
+
+    assert [s["name"] for s in shards] == ["1900-1903", "1904-1906", "1907-1909"]
+    assert shards[0]["params"] == {"dates": "1900/1903"}
+
+
+def test_plan_date_shards_caps_shards_at_year_count():
+    assert len(plan_date_shards(1900, 1901, 8)) == 2
+    with pytest.raises(ValueError):
+        plan_date_shards(1910, 1900, 2)
+
+
+def test_plan_facet_shards():
+    shards = plan_facet_shards("location_state", ["New York"])
+    assert shards == [{"name": "location_state-new-york", "params": {"fa": "location_state:New York"}}]
+
+
+def fake_fetch(collection, params, output_name, output_dir, **kwargs):
+    """
+    Writes one record per shard instead of calling the API.
+    """
+    path = f"{output_dir}/{raw_filename(output_name, kwargs['output_format'])}"
+    with open_raw(path, "w") as f:
+        write_ndjson_records(f, [{"id": output_name, "dates": params["dates"], "rate": kwargs.get("rate")}])
+    return path
+
+
+def test_sharded_crawl_writes_shard_files_and_merged_manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr("etl.shard_crawl.fetch_from_api", fake_fetch)
+    shards = plan_date_shards(1900, 1903, 4)
+
+    first = run_sharded_crawl("newspapers", shards, workers=2, shard_index=0, shard_count=2,
+                              output_dir=str(tmp_path))
+    second = run_sharded_crawl("newspapers", shards, workers=2, shard_index=1, shard_count=2,
+                               output_dir=str(tmp_path))
+
+    merged = merge_manifests([second, first], str(tmp_path / "newspapers_manifest.json"))
+
+    with open(merged) as f:
+        manifest = json.load(f)
+
+    assert [s["shard"] for s in manifest["shards"]] == ["1900-1900", "1901-1901", "1902-1902", "1903-1903"]
+    assert manifest["total_records"] == 4
+    assert (tmp_path / "newspapers_1902-1902_raw.ndjson").exists()
+
+
+def test_sharded_crawl_splits_the_rate_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr("etl.shard_crawl.fetch_from_api", fake_fetch)
+    shards = plan_date_shards(1900, 1903, 4)
+
+    rates = {}
+    for kwargs in ({"rate": 4}, {"delay": 2}, {"delay": 0}):
+        out_dir = tmp_path / str(len(rates))
+        out_dir.mkdir()
+        path = run_sharded_crawl("newspapers", shards, workers=2, output_dir=str(out_dir), **kwargs)
+        with open(path) as f:
+            shard_paths = [entry["path"] for entry in json.load(f)["shards"]]
+        rates[str(kwargs)] = {record["rate"] for p in shard_paths for record in iter_raw_records(p)}
+
+    assert rates == {"{'rate': 4}": {2.0}, "{'delay': 2}": {0.25}, "{'delay': 0}": {None}}
@@ -0,0 +1,129 @@
+import json
+
+import pandas as pd
+
+from etl.clean_csv import clean_newspapers_csv
+from etl.transform_and_clean import transform_and_clean
+from etl.transform_to_csv import json_to_csv
+
+
+def record(id, **overrides):
+    item = {
+        "date_issued": "1910-01-01",
+        "newspaper_title": ["Daily News"],
+        "library_of_congress_control_number": "sn123",
+        "language": ["English"],
+    }
+    item.update(overrides.pop("item", {}))
+    base = {
+        "id": id,
+        "title": f"Title {id}",
+        "location_city": ["Juneau"],
+        "location_state": ["Alaska"],
+        "location_country": ["United States"],
+        "subject": ["News"],
+        "digitized": True,
+        "item": item,
+    }
+    base.update(overrides)
+    return base
+
+
+RECORDS = [
+    record("a"),
+    record("a", title="Duplicate"),
+    record("b", title=""),
+    record("c", item={"date_issued": "not-a-date"}),
+    record("d", location_state=[]),
+    record("e", description="Some DESCRIPTION", item={"medium": "4 Pages"}),
+    record("", title="Blank id"),
+    record("f", subject=[], item={"date_issued": "January 5, 1911"}),
+    # Text that pandas would read back as NaN by default
+    record("n1", title="NA", description="null", url="N/A", item={"medium": "NaN"}),
+    record("n2", description="NA", location_city=["null"]),
+]
+
+
+def redirect_outputs(monkeypatch, directory):
+    monkeypatch.setattr("etl.clean_csv.OUTPUT_DIR", directory)
+    monkeypatch.setattr("etl.clean_csv.CLEANED_FILE", directory / "cleaned.csv")
+    monkeypatch.setattr("etl.clean_csv.REJECTED_FILE", directory / "rejected.csv")
+
+
+def test_fused_stage_matches_two_stage_pipeline(tmp_path, monkeypatch):
+    raw = tmp_path / "newspapers_raw.json"
+    raw.write_text(json.dumps(RECORDS))
+
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", tmp_path)
+    redirect_outputs(monkeypatch, tmp_path / "two_stage")
+    two_stage = clean_newspapers_csv(input_path=json_to_csv(str(raw)))
+
+    redirect_outputs(monkeypatch, tmp_path / "fused")
+    fused = transform_and_clean(str(raw))
+
+    assert fused.read_bytes() == two_stage.read_bytes()
+
+    fused_profile = (tmp_path / "fused" / "cleaned_profile.json").read_text()
+    assert json.loads(fused_profile) == json.loads((tmp_path / "two_stage" / "cleaned_profile.json").read_text())
+
+    fused_rejected = tmp_path / "fused" / "rejected.csv"
+    assert fused_rejected.read_bytes() == (tmp_path / "two_stage" / "rejected.csv").read_bytes()
+    assert pd.read_csv(fused_rejected)["reject_reason"].tolist() == [
+        "missing_title", "invalid_date", "missing_location_state", "missing_id",
+    ]
+
+    # NA-like text is kept as text on both paths
+    cleaned = pd.read_csv(fused, keep_default_na=False).set_index("id")
+    assert cleaned.loc["n1", ["title", "description", "url", "item_medium"]].tolist() == ["na", "null", "N/A", "nan"]
+    assert cleaned.loc["n2", ["description", "location_city"]].tolist() == ["na", "null"]
+    # Missing list fields stay JSON arrays
+    assert cleaned.loc["f", "subject"] == "[]"
+
+
+def test_fused_stage_skips_intermediate_csv(tmp_path, monkeypatch, capsys):
+    raw = tmp_path / "newspapers_raw.ndjson"
+    raw.write_text("".join(json.dumps(r) + "\n" for r in RECORDS))
+
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", tmp_path / "processed")
+    redirect_outputs(monkeypatch, tmp_path)
+
+    cleaned = transform_and_clean(str(raw), output_format="parquet")
+
+    assert cleaned.name == "cleaned.parquet"
+    assert not (tmp_path / "processed").exists()
+
+    df = pd.read_parquet(cleaned)
+    assert df["id"].tolist() == ["a", "e", "f", "n1", "n2"]
+    assert df.loc[df["id"] == "e", "description"].item() == "some description"
+    assert df.loc[df["id"] == "a", "item_medium"].item() == "unknown"
+
+    out = capsys.readouterr().out
+    assert "Duplicates removed:  1" in out
+    assert "Missing critical fields: 2" in out
+    assert "Invalid date formats:    1" in out
+    assert "Missing location fields: 1" in out
+
+
+def test_parquet_keeps_multi_valued_fields_as_lists(tmp_path, monkeypatch):
+    records = RECORDS + [record("g", subject=["Juneau, Alaska", "News"], language=[])]
+    raw = tmp_path / "newspapers_raw.json"
+    raw.write_text(json.dumps(records))
+
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", tmp_path)
+    redirect_outputs(monkeypatch, tmp_path / "two_stage")
+    two_stage = pd.read_parquet(clean_newspapers_csv(
+        input_path=json_to_csv(str(raw), output_format="parquet"), output_format="parquet"))
+
+    redirect_outputs(monkeypatch, tmp_path / "fused")
+    fused = pd.read_parquet(transform_and_clean(str(raw), output_format="parquet"))
+
+    for df in (two_stage, fused):
+        row = df[df["id"] == "g"].iloc[0]
+        assert list(row["subject"]) == ["juneau, alaska", "news"]
+        assert list(row["language"]) == []
+        assert list(row["item_language"]) == ["english"]
+
+    pd.testing.assert_frame_equal(
+        fused.map(lambda v: list(v) if hasattr(v, "tolist") else v),
+        two_stage.map(lambda v: list(v) if hasattr(v, "tolist") else v),
+    )
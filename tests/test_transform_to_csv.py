@@ -84,8 +84,175 @@ def test_json_to_csv_creates_valid_csv(tmp_path, monkeypatch):
 
     assert row["id"] == "123"
     assert row["title"] == "Test Title"
-    assert row["language"] == "english"
-    assert row["item_language"] == "eng"
+    # Multi-valued fields are JSON arrays in CSV
+    assert row["language"] == '["english"]'
+    assert row["item_language"] == '["eng"]'
     assert row["item_newspaper_title"] == "Daily News"
 
 
+
+
+def test_json_to_csv_reads_ndjson(tmp_path, monkeypatch):
+    ndjson_file = tmp_path / "stream_raw.ndjson"
+    ndjson_file.write_text(
+        '{"id":"1","title":"First","item":{"language":["eng"]}}\n'
+        '{"id":"2","title":"Second","item":{"language":["spa"]}}\n'
+    )
+
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", tmp_path)
+
+    csv_path = Path(json_to_csv(str(ndjson_file)))
+    assert csv_path.name == "stream.csv"
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["id"] for row in rows] == ["1", "2"]
+    assert rows[1]["item_language"] == '["spa"]'
+
+
+def legacy_row(item):
+    """
+    Row built the way json_to_csv did before the compiled extractor.
+    """
+    return {
+        "id": safe_get(item, "id"),
+        "title": safe_get(item, "title"),
+        "date": safe_get(item, "date"),
+        "description": safe_get(item, "description"),
+        "digitized": safe_get(item, "digitized"),
+        "language": safe_get(item, "language"),
+        "subject": safe_get(item, "subject"),
+        "location_city": safe_get(item, "location_city"),
+        "location_state": safe_get(item, "location_state"),
+        "location_country": safe_get(item, "location_country"),
+        "image_url": safe_get(item, "image_url").split(", ")[0] if safe_get(item, "image_url") else "",
+        "url": safe_get(item, "url"),
+        "item_date_issued": safe_get_nested(item, "item", "date_issued"),
+        "item_created_published": safe_get_nested(item, "item", "created_published"),
+        "item_medium": safe_get_nested(item, "item", "medium"),
+        "item_language": safe_get_nested(item, "item", "language"),
+        "item_newspaper_title": safe_get_nested(item, "item", "newspaper_title"),
+        "item_lccn": safe_get_nested(item, "item", "library_of_congress_control_number"),
+        "item_place_of_publication": safe_get_nested(item, "item", "place_of_publication"),
+    }
+
+
+def test_compiled_extractor_matches_safe_get_rules():
+    from etl.table_io import list_cell_values
+    from etl.transform_to_csv import CSV_FIELDS, FIELD_SPEC, LIST_FIELDS, compile_extractor, extract_list_row, extract_row
+
+    with open("data/raw/newspapers_raw.json") as f:
+        records = json.load(f)
+    records += [{}, {"item": None, "image_url": []}, {"item": {"language": []}, "subject": ["a", 1]}]
+
+    as_dict = compile_extractor(FIELD_SPEC, as_dict=True)
+    joined = compile_extractor(FIELD_SPEC)
+
+    for record in records:
+        expected = legacy_row(record)
+        assert dict(zip(CSV_FIELDS, joined(record))) == expected
+        assert as_dict(record) == expected
+
+        # CSV list cells decode to exactly the values Parquet keeps as lists
+        row, list_row = dict(zip(CSV_FIELDS, extract_row(record))), dict(zip(CSV_FIELDS, extract_list_row(record)))
+        for column in CSV_FIELDS:
+            if column in LIST_FIELDS:
+                assert list_cell_values(row[column]) == (list_row[column] or [])
+            else:
+                assert row[column] == expected[column]
+
+
+def test_csv_projection_covers_field_spec():
+    from etl.projection import CSV_PROJECTION
+    from etl.transform_to_csv import FIELD_SPEC
+
+    for _, path, _ in FIELD_SPEC:
+        if len(path) == 1:
+            assert CSV_PROJECTION[path[0]] is True
+        else:
+            assert path[1] in CSV_PROJECTION[path[0]]
+
+
+def test_json_to_csv_parquet_output_is_typed(tmp_path, monkeypatch):
+    import pandas as pd
+
+    json_file = tmp_path / "sample_raw.json"
+    json_file.write_text(json.dumps([
+        {"id": "1", "digitized": True, "language": ["english"], "item": {"medium": "4 pages"}},
+        {"id": "2", "digitized": False, "title": ""},
+    ]))
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", tmp_path)
+
+    parquet_path = Path(json_to_csv(str(json_file), output_format="parquet"))
+    assert parquet_path.name == "sample.parquet"
+
+    df = pd.read_parquet(parquet_path)
+    assert df["digitized"].tolist() == [True, False]
+    assert [None if v is None else list(v) for v in df["language"]] == [["english"], None]
+    assert df["item_medium"].tolist() == ["4 pages", None]
+
+
+def write_batch_inputs(raw_dir):
+    raw_dir.mkdir()
+    (raw_dir / "newspapers_1900-1909_raw.ndjson").write_text(
+        '{"id":"1","title":"First"}\n{"id":"2","title":"Second, with comma"}\n'
+    )
+    (raw_dir / "newspapers_1910-1919_raw.json").write_text(json.dumps([{"id": "3"}, {"id": "4"}]))
+    (raw_dir / "newspapers_1920-1929_raw.ndjson").write_text('{"id":"5"}\n')
+    # State files sharing the raw directory are skipped
+    (raw_dir / "checkpoint.json").write_text("{}")
+    (raw_dir / "newspapers_manifest_1of1.json").write_text("{}")
+
+
+def test_json_to_csv_batch_merges_in_input_order(tmp_path, monkeypatch):
+    from etl.transform_to_csv import json_to_csv_batch
+
+    raw_dir = tmp_path / "raw"
+    write_batch_inputs(raw_dir)
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", str(tmp_path / "processed"))
+
+    merged = Path(json_to_csv_batch(str(raw_dir), workers=2))
+    assert merged.name == "newspapers.csv"
+
+    with open(merged, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["id"] for row in rows] == ["1", "2", "3", "4", "5"]
+    assert rows[1]["title"] == "Second, with comma"
+
+    manifest = json.loads((tmp_path / "processed" / "newspapers_shards" / "manifest.json").read_text())
+    assert [shard["rows"] for shard in manifest["shards"]] == [2, 2, 1]
+    assert manifest["total_rows"] == 5
+
+
+def test_json_to_csv_batch_without_merge_keeps_shards(tmp_path, monkeypatch):
+    from etl.transform_to_csv import json_to_csv_batch
+
+    raw_dir = tmp_path / "raw"
+    write_batch_inputs(raw_dir)
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", str(tmp_path / "processed"))
+
+    manifest_path = json_to_csv_batch(str(raw_dir / "*_raw.ndjson"), workers=2, merge=False)
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    outputs = [Path(shard["output"]).name for shard in manifest["shards"]]
+    assert outputs == ["00000_newspapers_1900-1909.csv", "00001_newspapers_1920-1929.csv"]
+    assert not (tmp_path / "processed" / "newspapers.csv").exists()
+
+
+def test_json_to_csv_batch_merges_parquet(tmp_path, monkeypatch):
+    import pandas as pd
+    from etl.transform_to_csv import json_to_csv_batch
+
+    raw_dir = tmp_path / "raw"
+    write_batch_inputs(raw_dir)
+    monkeypatch.setattr("etl.transform_to_csv.PROCESSED_DIR", str(tmp_path / "processed"))
+
+    merged = json_to_csv_batch(str(raw_dir), output_name="all", output_format="parquet", workers=2)
+
+    df = pd.read_parquet(merged)
+    assert df["id"].tolist() == ["1", "2", "3", "4", "5"]
+    assert df["title"].tolist() == ["First", "Second, with comma", None, None, None]
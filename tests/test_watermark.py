@@ -0,0 +1,96 @@
+from datetime import date
+from unittest.mock import MagicMock
+
+from etl.watermark import (
+    advance_watermark,
+    incremental_params,
+    latest_record_date,
+    load_watermark,
+    read_stored_watermark,
+    save_watermark,
+)
+
+
+def test_latest_record_date():
+    results = [{"date": "1900-01-02"}, {"date": "1899-12-31"}, {}]
+    assert latest_record_date(results) == "1900-01-02"
+    assert latest_record_date(results, "1901-01-01") == "1901-01-01"
+    assert latest_record_date([]) is None
+
+
+def test_incremental_params():
+    params = incremental_params("1900-01-01")
+    assert params["dates"] == f"1900-01-01/{date.today().isoformat()}"
+    assert params["sb"] == "date"
+
+
+def test_incremental_params_overlap_a_shard_date_range():
+    assert incremental_params("1905-06-01", "1900/1909")["dates"] == "1905-06-01/1909-12-31"
+    assert incremental_params("1890-01-01", "1900/1909")["dates"] == "1900-01-01/1909-12-31"
+    assert incremental_params("1910-01-01", "1900-01-01/1909-12-31") is None
+
+
+def test_load_watermark_prefers_database(tmp_path, monkeypatch):
+    save_watermark("newspapers", "1890-01-01", str(tmp_path))
+
+    monkeypatch.setattr("etl.watermark.read_db_watermark", lambda: "1910-05-05")
+    assert load_watermark("newspapers", str(tmp_path)) == "1910-05-05"
+
+    monkeypatch.setattr("etl.watermark.read_db_watermark", lambda: None)
+    assert load_watermark("newspapers", str(tmp_path)) == "1890-01-01"
+
+
+class RecordingClient:
+    """
+    Serves one empty result page and records the URLs requested.
+    """
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url):
+        self.requested.append(url)
+        return MagicMock(status_code=200, json=lambda: {"results": [], "pagination": {}})
+
+
+def test_incremental_fetch_requests_only_newer_records(tmp_path, monkeypatch):
+    import etl.fetch_from_api as mod
+
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+    monkeypatch.setattr("etl.watermark.read_db_watermark", lambda: "1900-01-01")
+
+    client = RecordingClient()
+    mod.fetch_from_api(collection="newspapers", max_pages=1, incremental=True, client=client)
+
+    assert "dates=1900-01-01%2F" in client.requested[0]
+    assert "sb=date" in client.requested[0]
+
+    # Fetching alone never moves the watermark
+    assert not (tmp_path / "newspapers_watermark.json").exists()
+
+
+def test_incremental_shard_fetch_keeps_its_own_range(tmp_path, monkeypatch):
+    import etl.fetch_from_api as mod
+
+    monkeypatch.setattr(mod, "raw_data_saved_dir", str(tmp_path))
+    monkeypatch.setattr("etl.watermark.read_db_watermark", lambda: "1905-06-01")
+
+    client = RecordingClient()
+    mod.fetch_from_api(collection="newspapers", max_pages=1, incremental=True, client=client,
+                       params={"dates": "1900/1909"}, output_name="newspapers_1900-1909")
+    mod.fetch_from_api(collection="newspapers", max_pages=1, incremental=True, client=client,
+                       params={"dates": "1890/1899"}, output_name="newspapers_1890-1899")
+
+    # The later shard is narrowed to its part after the watermark; the older one isn't fetched
+    assert len(client.requested) == 1
+    assert "dates=1905-06-01%2F1909-12-31" in client.requested[0]
+
+
+def test_advance_watermark_uses_loaded_records_and_never_moves_back(tmp_path):
+    raw = tmp_path / "newspapers_raw.json"
+    raw.write_text('[{"date": "1901-02-03"}, {"date": "1899-01-01"}, {}]')
+
+    assert advance_watermark("newspapers", str(raw), str(tmp_path)) == "1901-02-03"
+    assert read_stored_watermark("newspapers", str(tmp_path)) == "1901-02-03"
+
+    raw.write_text('[{"date": "1850-01-01"}]')
+    assert advance_watermark("newspapers", str(raw), str(tmp_path)) == "1901-02-03"